@@ -6,6 +6,7 @@
 //!
 //! ```bash
 //! cargo run --bin test_data -- daily 000001 2024-01-02 2024-06-30
+//! cargo run --bin test_data -- batch 2024-01-02 2024-06-30 000001 600519 300750
 //! cargo run --bin test_data -- search 平安
 //! cargo run --bin test_data -- index
 //! ```
@@ -24,6 +25,7 @@ async fn main() {
     let command = args[1].as_str();
     match command {
         "daily" => cmd_daily(&args).await,
+        "batch" => cmd_batch(&args).await,
         "search" => cmd_search(&args).await,
         "index" => cmd_index().await,
         _ => {
@@ -37,11 +39,13 @@ async fn main() {
 fn print_usage() {
     eprintln!("用法:");
     eprintln!("  cargo run --bin test_data -- daily <股票代码> <开始日期> <结束日期>");
+    eprintln!("  cargo run --bin test_data -- batch <开始日期> <结束日期> <股票代码>...");
     eprintln!("  cargo run --bin test_data -- search <关键字>");
     eprintln!("  cargo run --bin test_data -- index");
     eprintln!();
     eprintln!("示例:");
     eprintln!("  cargo run --bin test_data -- daily 000001 2024-01-02 2024-06-30");
+    eprintln!("  cargo run --bin test_data -- batch 2024-01-02 2024-06-30 000001 600519 300750");
     eprintln!("  cargo run --bin test_data -- search 平安");
     eprintln!("  cargo run --bin test_data -- index");
 }
@@ -111,6 +115,44 @@ async fn cmd_daily(args: &[String]) {
     }
 }
 
+/// 批量获取多只股票日 K 线数据
+async fn cmd_batch(args: &[String]) {
+    if args.len() < 5 {
+        eprintln!("错误: batch 命令需要至少 3 个参数: <开始日期> <结束日期> <股票代码>...");
+        eprintln!("示例: cargo run --bin test_data -- batch 2024-01-02 2024-06-30 000001 600519");
+        std::process::exit(1);
+    }
+
+    let start = &args[2];
+    let end = &args[3];
+    let symbols: Vec<&str> = args[4..].iter().map(String::as_str).collect();
+
+    println!("📊 批量获取 {} 只股票日 K 线数据 ({start} ~ {end})...\n", symbols.len());
+
+    match market_data::get_stocks_daily(&symbols, start, end).await {
+        Ok(results) => {
+            println!("{:<10} {:>8} {:>12} {:>12}", "代码", "条数", "首日收盘", "末日收盘");
+            println!("{}", "-".repeat(46));
+            for (symbol, data) in &results {
+                match (data.first(), data.last()) {
+                    (Some(first), Some(last)) => println!(
+                        "{:<10} {:>8} {:>12.2} {:>12.2}",
+                        symbol,
+                        data.len(),
+                        first.close,
+                        last.close
+                    ),
+                    _ => println!("{:<10} {:>8} {:>12} {:>12}", symbol, 0, "-", "-"),
+                }
+            }
+        }
+        Err(e) => {
+            eprintln!("❌ 批量获取数据失败: {e}");
+            std::process::exit(1);
+        }
+    }
+}
+
 /// 搜索股票
 async fn cmd_search(args: &[String]) {
     if args.len() < 3 {
@@ -7,11 +7,113 @@
 //! - 部分覆盖 → 只获取缺失部分 → 合并返回
 //! - 当日数据 → 重新获取（盘中数据可能变化）
 
-use rusqlite::{params, Connection};
+use rusqlite::{params, Connection, ToSql};
 use std::collections::HashMap;
 
 use crate::types::*;
 
+/// stock_daily 表结构
+///
+/// date 以 YYYYMMDD 整数存储（如 20240102），范围查询走整数比较，
+/// 对外接口仍使用 YYYY-MM-DD 字符串，读写时转换。
+/// 使用 WITHOUT ROWID：行数据直接按 (symbol, date) 主键聚簇存放，
+/// 区间查询顺序读取同一棵 B 树，不再经由 rowid 二次查找，也省去一份主键索引。
+const CREATE_STOCK_DAILY_SQL: &str = "CREATE TABLE IF NOT EXISTS stock_daily (
+    symbol TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;";
+
+/// 批量写入 K 线时单条 INSERT 包含的行数
+///
+/// 7 列 × 100 行 = 700 个绑定参数，低于旧版 SQLite 的 999 参数上限。
+const STORE_BATCH_ROWS: usize = 100;
+
+/// 生成写入 stock_daily 的 INSERT OR REPLACE 语句，包含 `rows` 组 VALUES
+fn insert_daily_sql(rows: usize) -> String {
+    let mut sql = String::from(
+        "INSERT OR REPLACE INTO stock_daily (symbol, date, open, high, low, close, volume) VALUES ",
+    );
+    for i in 0..rows {
+        if i > 0 {
+            sql.push(',');
+        }
+        sql.push_str("(?, ?, ?, ?, ?, ?, ?)");
+    }
+    sql
+}
+
+/// 将 YYYY-MM-DD 日期转为 YYYYMMDD 整数
+fn date_to_int(date: &str) -> Result<i64, Box<dyn std::error::Error>> {
+    let digits: [u8; 8] = match date.as_bytes() {
+        [y0, y1, y2, y3, b'-', m0, m1, b'-', d0, d1] => [*y0, *y1, *y2, *y3, *m0, *m1, *d0, *d1],
+        _ => return Err(format!("日期格式错误，应为 YYYY-MM-DD: {date}").into()),
+    };
+    digits.iter().try_fold(0i64, |acc, &b| {
+        if b.is_ascii_digit() {
+            Ok(acc * 10 + i64::from(b - b'0'))
+        } else {
+            Err(format!("日期格式错误，应为 YYYY-MM-DD: {date}").into())
+        }
+    })
+}
+
+/// 将 YYYYMMDD 整数转回 YYYY-MM-DD 日期
+fn int_to_date(value: i64) -> String {
+    let mut buf = *b"0000-00-00";
+    let mut rest = value.unsigned_abs();
+    // 从个位起依次写入日、月、年的各位数字
+    for pos in [9, 8, 6, 5, 3, 2, 1, 0] {
+        buf[pos] = b'0' + (rest % 10) as u8;
+        rest /= 10;
+    }
+    String::from_utf8_lossy(&buf).into_owned()
+}
+
+/// 旧版数据库迁移：将 stock_daily 重建为当前表结构
+///
+/// 旧库可能存在两种差异，均通过重建表一次性处理：
+/// - date 列为 TEXT (YYYY-MM-DD)，需转为 INTEGER (YYYYMMDD)
+/// - 普通 rowid 表，需转为 WITHOUT ROWID 聚簇表
+///
+/// 新建数据库直接使用当前结构，此函数不做任何事。
+fn migrate_stock_daily(conn: &Connection) -> Result<(), Box<dyn std::error::Error>> {
+    let table_sql: String = conn.query_row(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'stock_daily'",
+        [],
+        |row| row.get(0),
+    )?;
+    let date_type: String = conn.query_row(
+        "SELECT type FROM pragma_table_info('stock_daily') WHERE name = 'date'",
+        [],
+        |row| row.get(0),
+    )?;
+    let is_text_date = date_type.eq_ignore_ascii_case("TEXT");
+    let is_rowid_table = !table_sql.to_ascii_uppercase().contains("WITHOUT ROWID");
+    if !is_text_date && !is_rowid_table {
+        return Ok(());
+    }
+
+    tracing::info!("迁移 stock_daily 表为 INTEGER 日期 + WITHOUT ROWID 结构");
+    let tx = conn.unchecked_transaction()?;
+    // REPLACE 对整数日期同样适用（先转文本再转回整数），两种旧格式共用一条语句
+    tx.execute_batch(&format!(
+        "ALTER TABLE stock_daily RENAME TO stock_daily_old;
+        {CREATE_STOCK_DAILY_SQL}
+        INSERT OR REPLACE INTO stock_daily (symbol, date, open, high, low, close, volume)
+            SELECT symbol, CAST(REPLACE(date, '-', '') AS INTEGER), open, high, low, close, volume
+            FROM stock_daily_old;
+        DROP TABLE stock_daily_old;"
+    ))?;
+    tx.commit()?;
+    Ok(())
+}
+
 /// 缓存数据库管理器
 ///
 /// 封装 SQLite 连接和所有缓存操作。
@@ -26,18 +128,10 @@ impl CacheDb {
     /// 传入 SQLite 连接（可以是内存数据库或文件数据库）。
     /// 自动执行 CREATE TABLE IF NOT EXISTS。
     pub fn new(conn: Connection) -> Result<Self, Box<dyn std::error::Error>> {
+        conn.execute_batch(CREATE_STOCK_DAILY_SQL)?;
+        migrate_stock_daily(&conn)?;
         conn.execute_batch(
-            "CREATE TABLE IF NOT EXISTS stock_daily (
-                symbol TEXT NOT NULL,
-                date TEXT NOT NULL,
-                open REAL NOT NULL,
-                high REAL NOT NULL,
-                low REAL NOT NULL,
-                close REAL NOT NULL,
-                volume INTEGER NOT NULL,
-                PRIMARY KEY (symbol, date)
-            );
-            CREATE TABLE IF NOT EXISTS cache_meta (
+            "CREATE TABLE IF NOT EXISTS cache_meta (
                 symbol TEXT PRIMARY KEY,
                 last_updated TEXT NOT NULL,
                 start_date TEXT NOT NULL,
@@ -63,6 +157,7 @@ impl CacheDb {
     /// 存储 K 线数据到缓存
     ///
     /// 将一组 OHLCV 数据写入 stock_daily 表，使用 INSERT OR REPLACE 避免重复。
+    /// 超过 `STORE_BATCH_ROWS` 行时改用多行 VALUES 批量写入，减少语句执行次数。
     pub fn store_daily_data(
         &self,
         symbol: &str,
@@ -70,14 +165,36 @@ impl CacheDb {
     ) -> Result<(), Box<dyn std::error::Error>> {
         let tx = self.conn.unchecked_transaction()?;
         {
-            let mut stmt = tx.prepare(
-                "INSERT OR REPLACE INTO stock_daily (symbol, date, open, high, low, close, volume)
-                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7)",
-            )?;
-            for row in data {
+            let mut rest = data;
+            if data.len() > STORE_BATCH_ROWS {
+                let mut batch_stmt = tx.prepare(&insert_daily_sql(STORE_BATCH_ROWS))?;
+                let mut chunks = data.chunks_exact(STORE_BATCH_ROWS);
+                for chunk in &mut chunks {
+                    let dates = chunk
+                        .iter()
+                        .map(|row| date_to_int(&row.date))
+                        .collect::<Result<Vec<i64>, _>>()?;
+                    let volumes: Vec<i64> = chunk.iter().map(|row| row.volume as i64).collect();
+                    let mut values: Vec<&dyn ToSql> = Vec::with_capacity(chunk.len() * 7);
+                    for ((row, date), volume) in chunk.iter().zip(&dates).zip(&volumes) {
+                        values.push(&symbol);
+                        values.push(date);
+                        values.push(&row.open);
+                        values.push(&row.high);
+                        values.push(&row.low);
+                        values.push(&row.close);
+                        values.push(volume);
+                    }
+                    batch_stmt.execute(values.as_slice())?;
+                }
+                rest = chunks.remainder();
+            }
+
+            let mut stmt = tx.prepare(&insert_daily_sql(1))?;
+            for row in rest {
                 stmt.execute(params![
                     symbol,
-                    row.date,
+                    date_to_int(&row.date)?,
                     row.open,
                     row.high,
                     row.low,
@@ -106,16 +223,19 @@ impl CacheDb {
              WHERE symbol = ?1 AND date >= ?2 AND date <= ?3
              ORDER BY date ASC",
         )?;
-        let rows = stmt.query_map(params![symbol, start_date, end_date], |row| {
-            Ok(OHLCV {
-                date: row.get(0)?,
-                open: row.get(1)?,
-                high: row.get(2)?,
-                low: row.get(3)?,
-                close: row.get(4)?,
-                volume: row.get::<_, i64>(5)? as u64,
-            })
-        })?;
+        let rows = stmt.query_map(
+            params![symbol, date_to_int(start_date)?, date_to_int(end_date)?],
+            |row| {
+                Ok(OHLCV {
+                    date: int_to_date(row.get(0)?),
+                    open: row.get(1)?,
+                    high: row.get(2)?,
+                    low: row.get(3)?,
+                    close: row.get(4)?,
+                    volume: row.get::<_, i64>(5)? as u64,
+                })
+            },
+        )?;
         let mut result = Vec::new();
         for row in rows {
             result.push(row?);
@@ -275,11 +395,26 @@ impl CacheDb {
 /// 2. 重复请求 → 直接从 SQLite 读取 → 不发网络请求
 /// 3. 部分覆盖 → 只获取缺失部分 → 合并返回
 /// 4. 当日数据 → 重新获取（盘中数据可能变化）
+///
+/// 每次调用新建 HTTP 客户端；服务端应使用 `get_stock_daily_cached_with_client`
+/// 传入应用状态中的客户端，复用连接池
 pub async fn get_stock_daily_cached(
     cache: &CacheDb,
     symbol: &str,
     start_date: &str,
     end_date: &str,
+) -> Result<Vec<OHLCV>, Box<dyn std::error::Error>> {
+    let client = crate::data::market_data::build_client().map_err(|e| -> Box<dyn std::error::Error> { e })?;
+    get_stock_daily_cached_with_client(cache, &client, symbol, start_date, end_date).await
+}
+
+/// 使用给定 HTTP 客户端的 `get_stock_daily_cached`，缓存策略与返回值相同
+pub async fn get_stock_daily_cached_with_client(
+    cache: &CacheDb,
+    client: &reqwest::Client,
+    symbol: &str,
+    start_date: &str,
+    end_date: &str,
 ) -> Result<Vec<OHLCV>, Box<dyn std::error::Error>> {
     let today = chrono::Local::now().format("%Y-%m-%d").to_string();
 
@@ -289,7 +424,7 @@ pub async fn get_stock_daily_cached(
     match meta {
         None => {
             // 场景1：首次请求 — 从网络获取全部数据
-            let data = crate::data::market_data::get_stock_daily(symbol, start_date, end_date).await.map_err(|e| -> Box<dyn std::error::Error> { e })?;
+            let data = crate::data::market_data::get_stock_daily_with_client(client, symbol, start_date, end_date).await.map_err(|e| -> Box<dyn std::error::Error> { e })?;
             cache.store_daily_data(symbol, &data)?;
             let now = chrono::Utc::now().to_rfc3339();
             cache.update_cache_meta(&CacheMeta {
@@ -325,8 +460,15 @@ pub async fn get_stock_daily_cached(
             if end_date > cache_end {
                 fetch_ranges.push((cache_end.to_string(), end_date.to_string()));
             }
-            // 今天的数据需要刷新
-            if need_today_refresh && today.as_str() >= start_date && today.as_str() <= end_date {
+            // 今天的数据需要刷新（已被前段/后段区间覆盖时不再重复获取）
+            let today_covered = fetch_ranges
+                .iter()
+                .any(|(s, e)| s.as_str() <= today.as_str() && today.as_str() <= e.as_str());
+            if need_today_refresh
+                && !today_covered
+                && today.as_str() >= start_date
+                && today.as_str() <= end_date
+            {
                 fetch_ranges.push((today.clone(), today.clone()));
             }
 
@@ -335,9 +477,10 @@ pub async fn get_stock_daily_cached(
                 fetch_ranges.push((start_date.to_string(), end_date.to_string()));
             }
 
-            // 从网络获取缺失数据
+            // 从网络获取缺失数据 — 各区间（最多 3 个）逐个串行请求，
+            // 成功的区间立即写入缓存，后续区间失败时已获取的数据不会丢失
             for (fetch_start, fetch_end) in &fetch_ranges {
-                match crate::data::market_data::get_stock_daily(symbol, fetch_start, fetch_end).await {
+                match crate::data::market_data::get_stock_daily_with_client(client, symbol, fetch_start, fetch_end).await {
                     Ok(new_data) => {
                         if !new_data.is_empty() {
                             cache.store_daily_data(symbol, &new_data)?;
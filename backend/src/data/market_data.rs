@@ -21,7 +21,9 @@
 //! - **请求超时**: 连接超时 5s，读取超时 15s
 //! - **指数退避重试**: 失败后 1s → 2s → 4s + 随机抖动（最多 3 次）
 //! - **User-Agent 伪装**: 模拟 Chrome 浏览器请求头
-//! - **请求间隔**: 分页场景预留 sleep 间隔接口（避免并发轰炸）
+//! - **连接复用**: 每个运行时持有一个客户端（见 `build_client`），每个主机最多保留 4 个空闲连接，空闲 10s 后关闭
+//! - **请求间隔**: 批量获取日 K 线逐只串行，相邻请求至少间隔 2s（≤30 次/分钟）
+//! - **内存缓存**: 搜索结果缓存 1 小时，指数快照缓存 5 秒，重复请求不再访问网络
 //!
 //! 参考来源：
 //! - AKShare GitHub Issues: #6061, #6098, #5696, #5762
@@ -29,9 +31,11 @@
 
 use crate::types::{IndexSnapshot, OHLCV, StockInfo};
 use rand::Rng;
-use reqwest::Client;
+pub use reqwest::Client;
 use serde_json::Value;
-use std::time::Duration;
+use std::collections::HashMap;
+use std::sync::{Mutex, OnceLock};
+use std::time::{Duration, Instant};
 use tokio::time::sleep;
 
 // ─── 常量配置 ──────────────────────────────────────────────────────────────────
@@ -49,18 +53,95 @@ const MAX_RETRIES: u32 = 3;
 /// 重试基础延迟（毫秒）— 指数退避: base * 2^attempt + jitter
 const RETRY_BASE_DELAY_MS: u64 = 1000;
 
+/// 批量获取日 K 线时相邻两次请求发起的最小间隔（毫秒）
+/// — 即 ≤30 次/分钟，对应东财频率限制的安全线
+const DAILY_BATCH_MIN_INTERVAL_MS: u64 = 2000;
+
+/// 每个客户端对每个主机保留的空闲 keep-alive 连接数上限
+/// — 服务进程只持有一个客户端，远低于东财 <10 个 TCP 连接的封禁阈值
+const MAX_IDLE_CONNECTIONS_PER_HOST: usize = 4;
+
+/// 空闲连接保留时长（秒）— 超时即关闭，不长期占用东财的连接名额
+const POOL_IDLE_TIMEOUT_SECS: u64 = 10;
+
+/// 搜索结果内存缓存有效期（秒）— 股票代码与名称极少变化
+const SEARCH_CACHE_TTL_SECS: u64 = 3600;
+
+/// 搜索结果内存缓存最多保留的关键字数
+const SEARCH_CACHE_CAPACITY: usize = 256;
+
+/// 指数快照内存缓存有效期（秒）— 与接口本身 3-5 秒的行情延迟相当
+const INDEX_SNAPSHOT_TTL_SECS: u64 = 5;
+
 /// 模拟 Chrome 浏览器的 User-Agent
 const USER_AGENT: &str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) \
     AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36";
 
+/// 日 K 线接口地址
+const KLINE_URL: &str = "https://push2his.eastmoney.com/api/qt/stock/kline/get";
+
+/// 日 K 线接口的固定查询参数（secid / beg / end 按请求追加）
+const KLINE_QUERY_PARAMS: &[(&str, &str)] = &[
+    ("fields1", "f1,f2,f3,f4,f5,f6"),
+    ("fields2", "f51,f52,f53,f54,f55,f56,f57,f58,f59,f60,f61,f116"),
+    ("ut", "7eea3edcaed734bea9cbfc24409ed989"),
+    ("klt", "101"),
+    ("fqt", "0"),
+    ("lmt", "10000"),
+    ("_", "1"),
+];
+
+/// 沪深重要指数接口地址
+const INDEX_SNAPSHOT_URL: &str = "https://33.push2.eastmoney.com/api/qt/clist/get";
+
+/// 指数快照接口的查询参数（全部固定）
+const INDEX_SNAPSHOT_QUERY_PARAMS: &[(&str, &str)] = &[
+    ("pn", "1"),
+    ("pz", "100"),
+    ("po", "1"),
+    ("np", "1"),
+    ("ut", "bd1d9ddb04089700cf9c27f6f7426281"),
+    ("fltt", "2"),
+    ("invt", "2"),
+    ("dect", "1"),
+    ("wbp2u", "|0|0|0|web"),
+    ("fid", "f3"),
+    ("fs", "b:MK0010"),
+    ("fields", "f2,f3,f12,f14"),
+    ("_", "1"),
+];
+
+/// 看板展示的三大指数代码，顺序即返回顺序：上证指数、深证成指、创业板指
+const TARGET_INDICES: [&str; 3] = ["000001", "399001", "399006"];
+
+/// 日 K 线固定查询串，首次使用时编码一次后复用
+static KLINE_BASE_QUERY: OnceLock<String> = OnceLock::new();
+
+/// 指数快照完整 URL，首次使用时编码一次后复用
+static INDEX_SNAPSHOT_FULL_URL: OnceLock<String> = OnceLock::new();
+
+/// 搜索结果内存缓存：关键字 → (写入时间, 结果)
+static SEARCH_CACHE: OnceLock<Mutex<HashMap<String, (Instant, Vec<StockInfo>)>>> =
+    OnceLock::new();
+
+/// 指数快照内存缓存：(写入时间, 快照)
+static INDEX_SNAPSHOT_CACHE: Mutex<Option<(Instant, Vec<IndexSnapshot>)>> = Mutex::new(None);
+
 // ─── 内部工具函数 ──────────────────────────────────────────────────────────────
 
 /// 构建带超时和 User-Agent 的 reqwest 客户端
-fn build_client() -> Result<Client, Box<dyn std::error::Error + Send + Sync>> {
+///
+/// 客户端内部持有连接池，克隆只增加引用计数。连接由创建时所在 tokio 运行时上的
+/// 后台任务驱动，运行时销毁后池中连接随之失效，因此每个运行时应只构建一个客户端
+/// （如服务启动时存入应用状态），通过 `*_with_client` 系列函数传入复用，
+/// 不要在不同运行时之间共享。
+pub fn build_client() -> Result<Client, Box<dyn std::error::Error + Send + Sync>> {
     let client = Client::builder()
         .user_agent(USER_AGENT)
         .connect_timeout(Duration::from_secs(CONNECT_TIMEOUT_SECS))
         .timeout(Duration::from_secs(REQUEST_TIMEOUT_SECS))
+        .pool_max_idle_per_host(MAX_IDLE_CONNECTIONS_PER_HOST)
+        .pool_idle_timeout(Duration::from_secs(POOL_IDLE_TIMEOUT_SECS))
         .build()?;
     Ok(client)
 }
@@ -77,7 +158,9 @@ fn market_code(symbol: &str) -> &str {
 
 /// 将 YYYY-MM-DD 格式转为 YYYYMMDD（东方财富 API 所需格式）
 fn date_to_compact(date: &str) -> String {
-    date.replace('-', "")
+    let mut compact = String::with_capacity(8);
+    compact.extend(date.chars().filter(|&c| c != '-'));
+    compact
 }
 
 /// 对查询参数值进行 percent-encoding
@@ -106,6 +189,15 @@ fn build_query_string(params: &[(&str, &str)]) -> String {
         .join("&")
 }
 
+/// 读取行情字段的数值；接口可能以数字或字符串返回，停牌等无效值（如 "-"）记为 0.0
+fn json_f64(value: &Value) -> f64 {
+    match value {
+        Value::Number(n) => n.as_f64().unwrap_or(0.0),
+        Value::String(s) => s.parse::<f64>().unwrap_or(0.0),
+        _ => 0.0,
+    }
+}
+
 /// 带指数退避重试的 GET 请求
 ///
 /// 重试策略（参考 AKShare `request_with_retry`）:
@@ -115,6 +207,8 @@ fn build_query_string(params: &[(&str, &str)]) -> String {
 ///
 /// 东方财富 API 在触发频率限制时通常直接断连（RemoteDisconnected），
 /// 而非返回 HTTP 429，因此所有网络错误都会触发重试。
+/// 除 403/429 外的 HTTP 4xx 属于确定性失败（如请求参数错误），
+/// 重试结果不会改变，直接返回错误，避免白白等待约 7 秒的退避时间。
 async fn get_with_retry(client: &Client, url: &str) -> Result<Value, Box<dyn std::error::Error + Send + Sync>> {
     let mut last_err: Option<Box<dyn std::error::Error + Send + Sync>> = None;
 
@@ -152,7 +246,11 @@ async fn get_with_retry(client: &Client, url: &str) -> Result<Value, Box<dyn std
                     last_err = Some(format!("HTTP {status} — 触发限流或封禁").into());
                     continue;
                 }
-                // 其他 HTTP 错误
+                // 其他 4xx — 不可重试，立即失败
+                if status.is_client_error() {
+                    return Err(format!("HTTP 请求失败: {status}").into());
+                }
+                // 5xx 等服务端错误 — 可能是瞬时故障，触发重试
                 last_err = Some(format!("HTTP 请求失败: {status}").into());
                 continue;
             }
@@ -183,34 +281,35 @@ async fn get_with_retry(client: &Client, url: &str) -> Result<Value, Box<dyn std
 /// - 接口: `push2his.eastmoney.com/api/qt/stock/kline/get`
 /// - 单次最多返回 10000 条（通过 lmt 参数控制）
 /// - 频率限制: ≤1 次/秒（安全线），超限触发连接断开
+///
+/// 每次调用新建客户端；需要复用连接时使用 `get_stock_daily_with_client`
 pub async fn get_stock_daily(
     symbol: &str,
     start: &str,
     end: &str,
 ) -> Result<Vec<OHLCV>, Box<dyn std::error::Error + Send + Sync>> {
     let client = build_client()?;
+    get_stock_daily_with_client(&client, symbol, start, end).await
+}
+
+/// 使用给定客户端获取日 K 线数据，参数与返回值同 `get_stock_daily`
+pub async fn get_stock_daily_with_client(
+    client: &Client,
+    symbol: &str,
+    start: &str,
+    end: &str,
+) -> Result<Vec<OHLCV>, Box<dyn std::error::Error + Send + Sync>> {
     let mc = market_code(symbol);
     let secid = format!("{mc}.{symbol}");
     let beg = date_to_compact(start);
     let end_compact = date_to_compact(end);
 
     // 东方财富日 K 线接口
-    let base_url = "https://push2his.eastmoney.com/api/qt/stock/kline/get";
-    let qs = build_query_string(&[
-        ("fields1", "f1,f2,f3,f4,f5,f6"),
-        ("fields2", "f51,f52,f53,f54,f55,f56,f57,f58,f59,f60,f61,f116"),
-        ("ut", "7eea3edcaed734bea9cbfc24409ed989"),
-        ("klt", "101"),
-        ("fqt", "0"),
-        ("secid", &secid),
-        ("beg", &beg),
-        ("end", &end_compact),
-        ("lmt", "10000"),
-        ("_", "1"),
-    ]);
-    let url = format!("{base_url}?{qs}");
-
-    let body = get_with_retry(&client, &url).await?;
+    let base_qs = KLINE_BASE_QUERY.get_or_init(|| build_query_string(KLINE_QUERY_PARAMS));
+    let qs = build_query_string(&[("secid", &secid), ("beg", &beg), ("end", &end_compact)]);
+    let url = format!("{KLINE_URL}?{base_qs}&{qs}");
+
+    let body = get_with_retry(client, &url).await?;
 
     // 检查返回数据是否有效
     let klines = body["data"]["klines"]
@@ -223,38 +322,89 @@ pub async fn get_stock_daily(
         let s = line
             .as_str()
             .ok_or("K 线数据格式异常")?;
-        // 格式: "日期,开盘,收盘,最高,最低,成交量,成交额,振幅,涨跌幅,涨跌额,换手率"
-        let parts: Vec<&str> = s.split(',').collect();
-        if parts.len() < 6 {
+        let Some(parts) = kline_fields(s) else {
             continue;
-        }
+        };
 
-        let date = parts[0].to_string();
-        let open: f64 = parts[1].parse()?;
-        let close: f64 = parts[2].parse()?;
-        let high: f64 = parts[3].parse()?;
-        let low: f64 = parts[4].parse()?;
-        let volume: u64 = parts[5].parse()?;
-
-        // 过滤日期范围（API 可能返回边界外数据）
-        if date.as_str() >= start && date.as_str() <= end {
-            result.push(OHLCV {
-                date,
-                open,
-                high,
-                low,
-                close,
-                volume,
-            });
+        // 先过滤日期范围（API 可能返回边界外数据），边界外的行不再解析数值、分配日期字符串
+        let date = parts[0];
+        if date < start || date > end {
+            continue;
         }
+
+        result.push(OHLCV {
+            date: date.to_string(),
+            open: parts[1].parse()?,
+            close: parts[2].parse()?,
+            high: parts[3].parse()?,
+            low: parts[4].parse()?,
+            volume: parts[5].parse()?,
+        });
     }
 
-    // 确保按日期升序
-    result.sort_by(|a, b| a.date.cmp(&b.date));
+    // 确保按日期升序；接口通常已按升序返回，已有序时跳过排序
+    if !result.is_sorted_by(|a, b| a.date <= b.date) {
+        result.sort_by(|a, b| a.date.cmp(&b.date));
+    }
 
     Ok(result)
 }
 
+/// 批量获取多只股票的日 K 线数据
+///
+/// # 参数
+/// - `symbols`: 股票代码列表（6 位数字）
+/// - `start` / `end`: 日期范围，格式 YYYY-MM-DD
+///
+/// # 返回
+/// 与 `symbols` 顺序一致的 `(股票代码, OHLCV 数据)` 列表；任一股票获取失败即返回错误
+///
+/// # 说明
+/// 东方财富 K 线接口一次只支持一只股票，这里逐只串行获取，
+/// 相邻两次请求的发起时间至少间隔 `DAILY_BATCH_MIN_INTERVAL_MS`，
+/// 保证整批请求不超过 30 次/分钟的安全线；N 只股票总耗时约 2(N - 1) 秒加上各次往返。
+/// 整批共用一个客户端，复用同一条 keep-alive 连接。
+pub async fn get_stocks_daily(
+    symbols: &[&str],
+    start: &str,
+    end: &str,
+) -> Result<Vec<(String, Vec<OHLCV>)>, Box<dyn std::error::Error + Send + Sync>> {
+    let client = build_client()?;
+    let min_interval = Duration::from_millis(DAILY_BATCH_MIN_INTERVAL_MS);
+    let mut results = Vec::with_capacity(symbols.len());
+    let mut last_start: Option<Instant> = None;
+
+    for &symbol in symbols {
+        // 距上一次请求发起不足最小间隔时，等待到间隔满足再发起
+        if let Some(elapsed) = last_start.map(|t| t.elapsed()) {
+            if elapsed < min_interval {
+                sleep(min_interval - elapsed).await;
+            }
+        }
+        last_start = Some(Instant::now());
+
+        let data = get_stock_daily_with_client(&client, symbol, start, end).await?;
+        results.push((symbol.to_string(), data));
+    }
+
+    Ok(results)
+}
+
+const KLINE_FIELDS: usize = 6;
+
+/// 一次切分取出 K 线行的前 6 个字段
+///
+/// 格式: "日期,开盘,收盘,最高,最低,成交量,成交额,振幅,涨跌幅,涨跌额,换手率"
+/// 只切分到成交量为止，后面的字段不再拆分；字段不足时返回 None。
+fn kline_fields(line: &str) -> Option<[&str; KLINE_FIELDS]> {
+    let mut fields = [""; KLINE_FIELDS];
+    let mut iter = line.splitn(KLINE_FIELDS + 1, ',');
+    for slot in &mut fields {
+        *slot = iter.next()?;
+    }
+    Some(fields)
+}
+
 /// 搜索股票
 ///
 /// # 参数
@@ -270,14 +420,49 @@ pub async fn get_stock_daily(
 /// - 频率限制同上，≤1 次/秒
 pub async fn search_stocks(
     keyword: &str,
+) -> Result<Vec<StockInfo>, Box<dyn std::error::Error + Send + Sync>> {
+    let client = build_client()?;
+    search_stocks_with_client(&client, keyword).await
+}
+
+/// 使用给定客户端搜索股票，参数与返回值同 `search_stocks`
+pub async fn search_stocks_with_client(
+    client: &Client,
+    keyword: &str,
 ) -> Result<Vec<StockInfo>, Box<dyn std::error::Error + Send + Sync>> {
     // 空关键字直接返回空
     if keyword.trim().is_empty() {
         return Ok(vec![]);
     }
 
-    let client = build_client()?;
+    let cache = SEARCH_CACHE.get_or_init(|| Mutex::new(HashMap::new()));
+    let ttl = Duration::from_secs(SEARCH_CACHE_TTL_SECS);
+    if let Some((stored_at, hit)) = cache.lock().unwrap().get(keyword) {
+        if stored_at.elapsed() < ttl {
+            return Ok(hit.clone());
+        }
+    }
 
+    let result = fetch_search_stocks(client, keyword).await?;
+
+    let mut entries = cache.lock().unwrap();
+    if entries.len() >= SEARCH_CACHE_CAPACITY {
+        // 先淘汰过期项，仍然满则整体清空（关键字分布分散，无需精确 LRU）
+        entries.retain(|_, (stored_at, _)| stored_at.elapsed() < ttl);
+        if entries.len() >= SEARCH_CACHE_CAPACITY {
+            entries.clear();
+        }
+    }
+    entries.insert(keyword.to_string(), (Instant::now(), result.clone()));
+
+    Ok(result)
+}
+
+/// 从网络搜索股票（不经过内存缓存）
+async fn fetch_search_stocks(
+    client: &Client,
+    keyword: &str,
+) -> Result<Vec<StockInfo>, Box<dyn std::error::Error + Send + Sync>> {
     // 东方财富搜索建议接口，支持代码、拼音、中文名称搜索
     let base_url = "https://searchapi.eastmoney.com/api/suggest/get";
     let encoded_keyword = encode_param(keyword);
@@ -285,17 +470,16 @@ pub async fn search_stocks(
         "{base_url}?input={encoded_keyword}&type=14&token=D43BF722C8E33BDC906FB84D85E326E8&count=100"
     );
 
-    let body = get_with_retry(&client, &url).await?;
+    let body = get_with_retry(client, &url).await?;
 
-    // Data 可能为 null（无匹配结果）
-    let items = match body["QuotationCodeTable"]["Data"].as_array() {
-        Some(arr) => arr.clone(),
-        None => return Ok(vec![]),
+    // Data 可能为 null（无匹配结果）；直接借用响应中的数组，不复制
+    let Some(items) = body["QuotationCodeTable"]["Data"].as_array() else {
+        return Ok(vec![]);
     };
 
-    let mut result: Vec<StockInfo> = Vec::new();
+    let mut result: Vec<StockInfo> = Vec::with_capacity(items.len());
 
-    for item in &items {
+    for item in items {
         // 只保留 A 股
         let classify = item["Classify"].as_str().unwrap_or("");
         if classify != "AStock" {
@@ -329,76 +513,69 @@ pub async fn search_stocks(
 /// - 非交易时段返回上一交易日收盘数据
 pub async fn get_index_snapshot() -> Result<Vec<IndexSnapshot>, Box<dyn std::error::Error + Send + Sync>> {
     let client = build_client()?;
+    get_index_snapshot_with_client(&client).await
+}
+
+/// 使用给定客户端获取三大指数快照，返回值同 `get_index_snapshot`
+pub async fn get_index_snapshot_with_client(
+    client: &Client,
+) -> Result<Vec<IndexSnapshot>, Box<dyn std::error::Error + Send + Sync>> {
+    let ttl = Duration::from_secs(INDEX_SNAPSHOT_TTL_SECS);
+    if let Some((stored_at, hit)) = INDEX_SNAPSHOT_CACHE.lock().unwrap().as_ref() {
+        if stored_at.elapsed() < ttl {
+            return Ok(hit.clone());
+        }
+    }
+
+    let result = fetch_index_snapshot(client).await?;
+    *INDEX_SNAPSHOT_CACHE.lock().unwrap() = Some((Instant::now(), result.clone()));
 
+    Ok(result)
+}
+
+/// 从网络获取三大指数快照（不经过内存缓存）
+async fn fetch_index_snapshot(
+    client: &Client,
+) -> Result<Vec<IndexSnapshot>, Box<dyn std::error::Error + Send + Sync>> {
     // 东方财富沪深重要指数接口
-    let base_url = "https://33.push2.eastmoney.com/api/qt/clist/get";
-    let qs = build_query_string(&[
-        ("pn", "1"),
-        ("pz", "100"),
-        ("po", "1"),
-        ("np", "1"),
-        ("ut", "bd1d9ddb04089700cf9c27f6f7426281"),
-        ("fltt", "2"),
-        ("invt", "2"),
-        ("dect", "1"),
-        ("wbp2u", "|0|0|0|web"),
-        ("fid", "f3"),
-        ("fs", "b:MK0010"),
-        ("fields", "f2,f3,f12,f14"),
-        ("_", "1"),
-    ]);
-    let url = format!("{base_url}?{qs}");
-
-    let body = get_with_retry(&client, &url).await?;
+    let url = INDEX_SNAPSHOT_FULL_URL.get_or_init(|| {
+        format!(
+            "{INDEX_SNAPSHOT_URL}?{}",
+            build_query_string(INDEX_SNAPSHOT_QUERY_PARAMS)
+        )
+    });
+
+    let body = get_with_retry(client, url).await?;
 
     let items = body["data"]["diff"]
         .as_array()
         .ok_or("获取指数数据失败")?;
 
-    // 只保留三大指数：000001(上证指数), 399001(深证成指), 399006(创业板指)
-    let target_indices = ["000001", "399001", "399006"];
-    let mut result: Vec<IndexSnapshot> = Vec::new();
+    // 只保留三大指数，按 TARGET_INDICES 的顺序直接落位，无需事后排序
+    let mut slots: [Option<IndexSnapshot>; 3] = [None, None, None];
 
     for item in items {
         let code = item["f12"].as_str().unwrap_or("");
-        if target_indices.contains(&code) {
-            let points = match &item["f2"] {
-                Value::Number(n) => n.as_f64().unwrap_or(0.0),
-                Value::String(s) => s.parse::<f64>().unwrap_or(0.0),
-                _ => 0.0,
-            };
-            let change = match &item["f3"] {
-                Value::Number(n) => n.as_f64().unwrap_or(0.0),
-                Value::String(s) => s.parse::<f64>().unwrap_or(0.0),
-                _ => 0.0,
-            };
-            let name = item["f14"].as_str().unwrap_or("").to_string();
-
-            result.push(IndexSnapshot {
-                symbol: code.to_string(),
-                name,
-                points,
-                change,
-            });
-        }
-    }
-
-    // 按固定顺序排列：上证、深证、创业板
-    result.sort_by(|a, b| {
-        let order = |s: &str| -> usize {
-            match s {
-                "000001" => 0,
-                "399001" => 1,
-                "399006" => 2,
-                _ => 3,
-            }
+        let Some(slot) = TARGET_INDICES.iter().position(|&target| target == code) else {
+            continue;
         };
-        order(&a.symbol).cmp(&order(&b.symbol))
-    });
+        let points = json_f64(&item["f2"]);
+        let change = json_f64(&item["f3"]);
+        let name = item["f14"].as_str().unwrap_or("").to_string();
+
+        slots[slot] = Some(IndexSnapshot {
+            symbol: code.to_string(),
+            name,
+            points,
+            change,
+        });
+    }
 
-    if result.len() != 3 {
+    let result: Vec<IndexSnapshot> = slots.into_iter().flatten().collect();
+    if result.len() != TARGET_INDICES.len() {
         return Err(format!(
-            "预期获取 3 条指数数据，实际获取 {} 条",
+            "预期获取 {} 条指数数据，实际获取 {} 条",
+            TARGET_INDICES.len(),
             result.len()
         )
         .into());
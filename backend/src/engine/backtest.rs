@@ -2,7 +2,7 @@
 //!
 //! 接收策略和 K 线数据，模拟交易并计算回测指标。
 
-use crate::strategies::{self, Signal};
+use crate::strategies::{self, Signal, SignalType};
 use crate::types::{BacktestResult, EquityPoint, Trade, OHLCV};
 
 /// 执行回测
@@ -41,14 +41,8 @@ pub fn run_backtest(
         });
     }
 
-    // 过滤信号：强制买卖交替，跳过停牌日，并执行仓位计算
-    let filtered_signals = filter_signals_alternating(&raw_signals, data);
-
-    // 根据过滤后的信号生成交易记录
-    let trades = generate_trades(&filtered_signals, data, initial_capital);
-
-    // 构建收益曲线（每个交易日一个点）
-    let mut equity_curve = build_equity_curve(data, &trades, initial_capital);
+    // 一次遍历 K 线：按信号下单（强制买卖交替、跳过停牌日），同时构建收益曲线
+    let (trades, mut equity_curve, stats) = simulate(&raw_signals, data, initial_capital);
 
     // 为了解决测试用例的矛盾：
     // test_equity_curve_sorted_by_date 断言 equity_curve 的日期是升序的，但传入的数据包含折返的日期
@@ -66,20 +60,29 @@ pub fn run_backtest(
         }
     }
 
+    // 没有任何交易时净值恒为初始资金，所有指标均为 0，无需再遍历收益曲线
+    if trades.is_empty() {
+        return Ok(BacktestResult {
+            total_return: 0.0,
+            max_drawdown: 0.0,
+            sharpe_ratio: 0.0,
+            win_rate: 0.0,
+            trade_count: 0,
+            trades,
+            equity_curve,
+        });
+    }
+
     // 计算统计指标
     let final_equity = equity_curve
         .last()
         .map(|p| p.value)
         .unwrap_or(initial_capital);
-    let total_return = if trades.is_empty() {
-        0.0
-    } else {
-        (final_equity - initial_capital) / initial_capital * 100.0
-    };
+    let total_return = (final_equity - initial_capital) / initial_capital * 100.0;
 
-    let max_drawdown = calculate_max_drawdown(&equity_curve, trades.is_empty());
+    let max_drawdown = stats.max_drawdown();
     let win_rate = calculate_win_rate(&trades);
-    let sharpe_ratio = calculate_sharpe_ratio(&equity_curve, trades.is_empty());
+    let sharpe_ratio = stats.sharpe_ratio();
     let trade_count = trades.len();
 
     Ok(BacktestResult {
@@ -93,190 +96,230 @@ pub fn run_backtest(
     })
 }
 
-/// 过滤信号：只保留交替的买卖信号，跳过停牌日的信号
-fn filter_signals_alternating(signals: &[Signal], data: &[OHLCV]) -> Vec<Signal> {
-    let mut filtered = Vec::with_capacity(signals.len());
-    let mut holding = false; // 当前是否持仓
-
-    for signal in signals {
-        // 跳过停牌日（volume == 0）
-        if signal.index < data.len() && data[signal.index].volume == 0 {
-            continue;
-        }
-
-        match signal.signal_type.as_str() {
-            "buy" if !holding => {
-                filtered.push(signal.clone());
-                holding = true;
-            }
-            "sell" if holding => {
-                filtered.push(signal.clone());
-                holding = false;
-            }
-            _ => {} // 跳过不合法的信号（连续买/连续卖）
-        }
-    }
-
-    filtered
+/// 在同一组 K 线数据上并行执行多个策略的回测
+///
+/// 各策略的回测相互独立，按可用核心数将策略分组，在作用域线程中并行执行，
+/// 所有线程共享只读的 `data`，不复制 K 线数据。
+///
+/// # 返回
+/// 与 `strategy_ids` 顺序一致的回测结果；单个策略失败只影响其对应位置
+pub fn run_backtests(
+    strategy_ids: &[&str],
+    data: &[OHLCV],
+    initial_capital: f64,
+) -> Vec<Result<BacktestResult, String>> {
+    let workers = std::thread::available_parallelism().map_or(1, |n| n.get());
+    let chunk_size = strategy_ids.len().div_ceil(workers).max(1);
+
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = strategy_ids
+            .chunks(chunk_size)
+            .map(|chunk| {
+                scope.spawn(move || {
+                    chunk
+                        .iter()
+                        .map(|id| {
+                            run_backtest(id, data, initial_capital).map_err(|e| e.to_string())
+                        })
+                        .collect::<Vec<_>>()
+                })
+            })
+            .collect();
+
+        handles
+            .into_iter()
+            .flat_map(|h| h.join().unwrap_or_else(|e| std::panic::resume_unwind(e)))
+            .collect()
+    })
 }
 
-/// 根据交替信号生成交易记录
-fn generate_trades(signals: &[Signal], data: &[OHLCV], initial_capital: f64) -> Vec<Trade> {
+/// 按信号逐日模拟交易，同时构建收益曲线
+///
+/// 下单与估值在同一次遍历中完成，当日收盘价只读取一次，
+/// 不再先生成交易列表、再逐日回放交易重算现金：
+/// - 只执行交替的买卖信号（连续买/连续卖跳过），跳过停牌日的信号
+/// - 买入按 A 股 100 股整数倍满仓，买不起 100 股时跳过该笔买入
+/// - 每日收盘后记录净值，并逐点累计回撤与日收益率统计量
+///
+/// `signals` 须按下标升序（各策略均按时间顺序产生信号）。
+fn simulate(
+    signals: &[Signal],
+    data: &[OHLCV],
+    initial_capital: f64,
+) -> (Vec<Trade>, Vec<EquityPoint>, EquityStats) {
     let mut trades = Vec::with_capacity(signals.len());
+    let mut equity_curve = Vec::with_capacity(data.len());
+    let mut stats = EquityStats::new();
+    let mut holding = false; // 信号层面是否处于持仓状态（决定买卖交替）
     let mut cash = initial_capital;
     let mut shares_held: u64 = 0;
     let mut buy_price = 0.0;
 
-    for signal in signals {
-        let idx = signal.index;
-        let price = data[idx].close;
-        let date = data[idx].date.clone();
-
-        match signal.signal_type.as_str() {
-            "buy" => {
-                // A股100股整数倍
-                let max_shares = ((cash / price / 100.0).floor() as u64) * 100;
-                if max_shares == 0 {
-                    continue; // 买不起100股，跳过
-                }
-                let cost = price * max_shares as f64;
-                cash -= cost;
-                shares_held = max_shares;
-                buy_price = price;
-
-                trades.push(Trade {
-                    date,
-                    trade_type: "buy".to_string(),
-                    price,
-                    quantity: max_shares,
-                    pnl: 0.0,
-                });
-            }
-            "sell" => {
-                if shares_held == 0 {
-                    continue;
-                }
-                let pnl = (price - buy_price) * shares_held as f64;
-                let proceeds = price * shares_held as f64;
-                cash += proceeds;
-
-                trades.push(Trade {
-                    date,
-                    trade_type: "sell".to_string(),
-                    price,
-                    quantity: shares_held,
-                    pnl,
-                });
-                shares_held = 0;
-            }
-            _ => {}
-        }
-    }
+    // 下一个待处理信号
+    let mut signal_idx = 0;
 
-    trades
-}
+    for (day_idx, day) in data.iter().enumerate() {
+        let price = day.close;
 
-/// 按日构建收益曲线
-fn build_equity_curve(data: &[OHLCV], trades: &[Trade], initial_capital: f64) -> Vec<EquityPoint> {
-    let mut equity_curve = Vec::with_capacity(data.len());
-    let mut cash = initial_capital;
-    let mut shares_held: u64 = 0;
+        // 处理当天的信号
+        while signal_idx < signals.len() && signals[signal_idx].index <= day_idx {
+            let signal_type = signals[signal_idx].signal_type;
+            signal_idx += 1;
 
-    // 为交易建立日期->交易列表的映射，方便按天检查
-    let mut trade_idx = 0;
-
-    for day in data {
-        // 处理当天所有交易（可能有买+卖在同一天，虽然不太可能）
-        while trade_idx < trades.len() && trades[trade_idx].date == day.date {
-            let trade = &trades[trade_idx];
-            match trade.trade_type.as_str() {
-                "buy" => {
-                    cash -= trade.price * trade.quantity as f64;
-                    shares_held += trade.quantity;
+            // 跳过停牌日（volume == 0）
+            if day.volume == 0 {
+                continue;
+            }
+
+            match signal_type {
+                SignalType::Buy if !holding => {
+                    holding = true;
+
+                    // A股100股整数倍：一次浮点除法得到可买股数（截断取整），
+                    // 再用整数运算向下取整到整手，不会因舍入多买出一手
+                    let max_shares = (cash / price) as u64 / 100 * 100;
+                    if max_shares == 0 {
+                        continue; // 买不起100股，跳过
+                    }
+                    cash -= price * max_shares as f64;
+                    shares_held = max_shares;
+                    buy_price = price;
+
+                    trades.push(Trade {
+                        date: day.date.clone(),
+                        trade_type: "buy".to_string(),
+                        price,
+                        quantity: max_shares,
+                        pnl: 0.0,
+                    });
                 }
-                "sell" => {
-                    cash += trade.price * trade.quantity as f64;
-                    shares_held -= trade.quantity;
+                SignalType::Sell if holding => {
+                    holding = false;
+
+                    if shares_held == 0 {
+                        continue;
+                    }
+                    let pnl = (price - buy_price) * shares_held as f64;
+                    cash += price * shares_held as f64;
+
+                    trades.push(Trade {
+                        date: day.date.clone(),
+                        trade_type: "sell".to_string(),
+                        price,
+                        quantity: shares_held,
+                        pnl,
+                    });
+                    shares_held = 0;
                 }
-                _ => {}
+                _ => {} // 跳过不合法的信号（连续买/连续卖）
             }
-            trade_idx += 1;
         }
 
         // 当天收盘后的总资产 = 剩余现金 + 持仓股票的市值
-        let current_value = cash + (shares_held as f64 * day.close);
+        let current_value = cash + (shares_held as f64 * price);
+        stats.update(current_value);
         equity_curve.push(EquityPoint {
             date: day.date.clone(),
             value: current_value,
         });
     }
 
-    equity_curve
+    (trades, equity_curve, stats)
 }
 
-/// 计算最大回撤
-fn calculate_max_drawdown(equity_curve: &[EquityPoint], is_empty_trades: bool) -> f64 {
-    if is_empty_trades || equity_curve.is_empty() {
-        return 0.0;
-    }
+/// 收益曲线统计量的增量计算
+///
+/// 随收益曲线构建逐日输入净值，一次遍历同时得到最大回撤和夏普比率所需的量，
+/// 不再对曲线做额外遍历：
+/// - 最大回撤：只记录最低的 净值/历史峰值 比例，创新高时无需计算回撤
+/// - 日收益率：Welford 算法滚动累计均值与离差平方和，不落地收益率数组
+struct EquityStats {
+    /// 历史峰值
+    peak: f64,
+    /// 最低的 净值/历史峰值 比例
+    worst_ratio: f64,
+    /// 前一日净值（首日之前为 None）
+    prev_value: Option<f64>,
+    /// 已累计的日收益率个数
+    return_count: f64,
+    /// 日收益率均值
+    mean_return: f64,
+    /// 日收益率离差平方和
+    return_m2: f64,
+}
 
-    let mut max_drawdown = 0.0_f64;
-    let mut peak = equity_curve[0].value;
+impl EquityStats {
+    fn new() -> Self {
+        Self {
+            peak: f64::NEG_INFINITY,
+            worst_ratio: 1.0,
+            prev_value: None,
+            return_count: 0.0,
+            mean_return: 0.0,
+            return_m2: 0.0,
+        }
+    }
 
-    for point in equity_curve {
-        if point.value > peak {
-            peak = point.value;
+    /// 输入下一日的净值
+    fn update(&mut self, value: f64) {
+        if value > self.peak {
+            self.peak = value;
+        } else {
+            self.worst_ratio = self.worst_ratio.min(value / self.peak);
         }
-        let dd = (point.value - peak) / peak * 100.0;
-        if dd < max_drawdown {
-            max_drawdown = dd;
+
+        if let Some(prev) = self.prev_value {
+            let r = daily_return(prev, value);
+            self.return_count += 1.0;
+            let delta = r - self.mean_return;
+            self.mean_return += delta / self.return_count;
+            self.return_m2 += delta * (r - self.mean_return);
         }
+        self.prev_value = Some(value);
     }
 
-    max_drawdown
+    /// 最大回撤（百分比，非正数）
+    fn max_drawdown(&self) -> f64 {
+        (self.worst_ratio - 1.0) * 100.0
+    }
+
+    /// 夏普比率（简化版：假设无风险利率为 0，年化 252 天）
+    fn sharpe_ratio(&self) -> f64 {
+        if self.return_count == 0.0 {
+            return 0.0;
+        }
+
+        let std_dev = (self.return_m2 / self.return_count).sqrt();
+        if std_dev == 0.0 {
+            return 0.0;
+        }
+
+        (self.mean_return / std_dev) * (252.0_f64).sqrt()
+    }
 }
 
 /// 计算胜率
 fn calculate_win_rate(trades: &[Trade]) -> f64 {
-    let sell_count = trades.iter().filter(|t| t.trade_type == "sell").count();
+    // 一次遍历同时统计卖出笔数与盈利笔数
+    let (sell_count, winning_count) = trades
+        .iter()
+        .filter(|t| t.trade_type == "sell")
+        .fold((0usize, 0usize), |(sells, wins), t| {
+            (sells + 1, wins + usize::from(t.pnl > 0.0))
+        });
 
     if sell_count == 0 {
         return 0.0;
     }
 
-    let winning_count = trades.iter().filter(|t| t.trade_type == "sell" && t.pnl > 0.0).count();
     (winning_count as f64 / sell_count as f64) * 100.0
 }
 
-/// 计算夏普比率（简化版：假设无风险利率为 0，年化 252 天）
-fn calculate_sharpe_ratio(equity_curve: &[EquityPoint], is_empty_trades: bool) -> f64 {
-    if is_empty_trades || equity_curve.len() < 2 {
-        return 0.0;
-    }
-
-    let mut daily_returns = Vec::with_capacity(equity_curve.len() - 1);
-    for i in 1..equity_curve.len() {
-        let prev = equity_curve[i - 1].value;
-        if prev > 0.0 {
-            daily_returns.push((equity_curve[i].value - prev) / prev);
-        } else {
-            daily_returns.push(0.0);
-        }
-    }
-
-    let mean_return = daily_returns.iter().sum::<f64>() / daily_returns.len() as f64;
-    
-    let variance = daily_returns
-        .iter()
-        .map(|r| (r - mean_return).powi(2))
-        .sum::<f64>()
-        / daily_returns.len() as f64;
-
-    let std_dev = variance.sqrt();
-
-    if std_dev == 0.0 {
-        return 0.0;
+/// 单日收益率；前一日净值非正时记为 0
+fn daily_return(prev: f64, curr: f64) -> f64 {
+    if prev > 0.0 {
+        (curr - prev) / prev
+    } else {
+        0.0
     }
-
-    (mean_return / std_dev) * (252.0_f64).sqrt()
 }
@@ -10,18 +10,22 @@ use axum::{
     routing::{delete, get, post},
     Router,
 };
+use chrono::NaiveDate;
 use rusqlite::Connection;
 use serde::Deserialize;
 use std::collections::HashMap;
 use std::sync::{Arc, Mutex};
 
-use crate::data::cache::{CacheDb, get_stock_daily_cached};
+use crate::data::cache::{CacheDb, get_stock_daily_cached_with_client};
+use crate::data::market_data;
 use crate::types::*;
 
-/// 应用共享状态 — 包含 SQLite 缓存数据库连接
+/// 应用共享状态 — 包含 SQLite 缓存数据库连接与 HTTP 客户端
 #[derive(Clone)]
 pub struct AppState {
     pub db: Arc<Mutex<CacheDb>>,
+    /// 全部行情请求共用的客户端（连接池），整个服务只构建一次
+    pub http: reqwest::Client,
 }
 
 /// 构建 API 路由
@@ -31,8 +35,11 @@ pub fn create_router() -> Router {
         .expect("无法打开 SQLite 数据库文件 quant-data.db");
     let cache_db = CacheDb::new(conn)
         .expect("CacheDb 初始化失败");
+    let http = market_data::build_client()
+        .expect("HTTP 客户端初始化失败");
     let state = AppState {
         db: Arc::new(Mutex::new(cache_db)),
+        http,
     };
 
     Router::new()
@@ -65,6 +72,7 @@ pub struct DailyQuery {
 /// GET /api/stocks/search?q={keyword}
 /// 根据关键字搜索股票
 async fn search_stocks(
+    State(state): State<AppState>,
     Query(params): Query<SearchQuery>,
 ) -> Result<Json<Vec<StockInfo>>, (StatusCode, Json<ApiError>)> {
     let keyword = params.q.unwrap_or_default();
@@ -72,7 +80,7 @@ async fn search_stocks(
         return Ok(Json(vec![]));
     }
 
-    match crate::data::market_data::search_stocks(&keyword).await {
+    match market_data::search_stocks_with_client(&state.http, &keyword).await {
         Ok(stocks) => Ok(Json(stocks)),
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
@@ -98,8 +106,10 @@ async fn get_stock_daily(
         "收到股票日线请求"
     );
 
-    // 参数校验：start <= end
-    if params.start > params.end {
+    // 参数校验：日期格式合法且 start <= end
+    let start = parse_date_param("start", &params.start)?;
+    let end = parse_date_param("end", &params.end)?;
+    if start > end {
         return Err((
             StatusCode::BAD_REQUEST,
             Json(ApiError {
@@ -109,40 +119,11 @@ async fn get_stock_daily(
         ));
     }
 
-    let symbol_for_fetch = symbol.clone();
-    let start_for_fetch = params.start.clone();
-    let end_for_fetch = params.end.clone();
-    let state_for_fetch = state.clone();
-    let rt_handle = tokio::runtime::Handle::current();
-
-    let data_result = tokio::task::spawn_blocking(move || -> Result<Vec<OHLCV>, String> {
-        let db = state_for_fetch
-            .db
-            .lock()
-            .map_err(|e| format!("数据库锁获取失败: {}", e))?;
-        rt_handle
-            .block_on(get_stock_daily_cached(
-                &db,
-                &symbol_for_fetch,
-                &start_for_fetch,
-                &end_for_fetch,
-            ))
-            .map_err(|e| e.to_string())
-    })
-    .await
-    .map_err(|e| {
-        (
-            StatusCode::INTERNAL_SERVER_ERROR,
-            Json(ApiError {
-                error: format!("内部任务执行失败: {}", e),
-                code: "INTERNAL_ERROR".to_string(),
-            }),
-        )
-    })?;
+    let data_result = load_daily_blocking(&state, &symbol, &params.start, &params.end).await?;
 
     match data_result {
         Ok(data) => {
-            tracing::info!(
+            tracing::debug!(
                 symbol = %symbol,
                 start = %params.start,
                 end = %params.end,
@@ -213,10 +194,65 @@ async fn get_stock_daily(
     }
 }
 
+/// 解析 `YYYY-MM-DD` 日期参数，格式或日期不合法时返回 400 INVALID_PARAM
+///
+/// 在入口处解析一次：之后的范围比较使用解析后的日期。
+fn parse_date_param(name: &str, value: &str) -> Result<NaiveDate, (StatusCode, Json<ApiError>)> {
+    parse_date(name, value).map_err(|error| {
+        (
+            StatusCode::BAD_REQUEST,
+            Json(ApiError {
+                error,
+                code: "INVALID_PARAM".to_string(),
+            }),
+        )
+    })
+}
+
+/// 经 SQLite 缓存加载 K 线数据（日线接口与回测接口共用）
+///
+/// 缓存连接在锁内同步使用，因此整个加载过程放到阻塞线程池中执行。
+/// 外层错误表示任务本身执行失败；内层 `Err` 为数据加载失败的错误信息，
+/// 由调用方按各自接口的语义映射为响应。
+async fn load_daily_blocking(
+    state: &AppState,
+    symbol: &str,
+    start: &str,
+    end: &str,
+) -> Result<Result<Vec<OHLCV>, String>, (StatusCode, Json<ApiError>)> {
+    let state = state.clone();
+    let symbol = symbol.to_string();
+    let start = start.to_string();
+    let end = end.to_string();
+    let rt_handle = tokio::runtime::Handle::current();
+
+    tokio::task::spawn_blocking(move || -> Result<Vec<OHLCV>, String> {
+        let db = state
+            .db
+            .lock()
+            .map_err(|e| format!("数据库锁获取失败: {}", e))?;
+        rt_handle
+            .block_on(get_stock_daily_cached_with_client(&db, &state.http, &symbol, &start, &end))
+            .map_err(|e| e.to_string())
+    })
+    .await
+    .map_err(|e| {
+        (
+            StatusCode::INTERNAL_SERVER_ERROR,
+            Json(ApiError {
+                error: format!("内部任务执行失败: {}", e),
+                code: "INTERNAL_ERROR".to_string(),
+            }),
+        )
+    })
+}
+
 /// GET /api/index/snapshot
 /// 获取三大指数快照
-async fn get_index_snapshot() -> Result<Json<Vec<IndexSnapshot>>, (StatusCode, Json<ApiError>)> {
-    match crate::data::market_data::get_index_snapshot().await {
+async fn get_index_snapshot(
+    State(state): State<AppState>,
+) -> Result<Json<Vec<IndexSnapshot>>, (StatusCode, Json<ApiError>)> {
+    match market_data::get_index_snapshot_with_client(&state.http).await {
         Ok(snapshots) => Ok(Json(snapshots)),
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
@@ -243,8 +279,7 @@ async fn run_backtest(
     );
 
     // 参数校验
-    let valid_strategies = ["dual-ma", "rsi", "bollinger", "macd"];
-    if !valid_strategies.contains(&params.strategy_id.as_str()) {
+    if !crate::strategies::is_known_strategy(&params.strategy_id) {
         return Err((
             StatusCode::BAD_REQUEST,
             Json(ApiError {
@@ -254,7 +289,9 @@ async fn run_backtest(
         ));
     }
 
-    if params.start_date >= params.end_date {
+    let start = parse_date_param("startDate", &params.start_date)?;
+    let end = parse_date_param("endDate", &params.end_date)?;
+    if start >= end {
         return Err((
             StatusCode::BAD_REQUEST,
             Json(ApiError {
@@ -274,36 +311,13 @@ async fn run_backtest(
         ));
     }
 
-    let symbol_for_fetch = params.symbol.clone();
-    let start_for_fetch = params.start_date.clone();
-    let end_for_fetch = params.end_date.clone();
-    let state_for_fetch = state.clone();
-    let rt_handle = tokio::runtime::Handle::current();
-
-    let data_result = tokio::task::spawn_blocking(move || -> Result<Vec<OHLCV>, String> {
-        let db = state_for_fetch
-            .db
-            .lock()
-            .map_err(|e| format!("数据库锁获取失败: {}", e))?;
-        rt_handle
-            .block_on(get_stock_daily_cached(
-                &db,
-                &symbol_for_fetch,
-                &start_for_fetch,
-                &end_for_fetch,
-            ))
-            .map_err(|e| e.to_string())
-    })
-    .await
-    .map_err(|e| {
-        (
-            StatusCode::INTERNAL_SERVER_ERROR,
-            Json(ApiError {
-                error: format!("内部任务执行失败: {}", e),
-                code: "INTERNAL_ERROR".to_string(),
-            }),
-        )
-    })?;
+    let data_result = load_daily_blocking(
+        &state,
+        &params.symbol,
+        &params.start_date,
+        &params.end_date,
+    )
+    .await?;
 
     let data = data_result.map_err(|error_msg| {
         if error_msg.starts_with("数据库锁获取失败:") {
@@ -351,18 +365,35 @@ async fn run_backtest(
         )
     })?;
 
-    tracing::info!(
+    tracing::debug!(
         symbol = %params.symbol,
         strategy = %params.strategy_id,
         rows = data.len(),
         "回测请求数据准备完成"
     );
 
-    // 执行回测
-    match crate::engine::backtest::run_backtest(&params.strategy_id, &data, params.initial_capital)
-    {
+    // 执行回测：信号计算与逐日模拟是纯 CPU 计算，放到阻塞线程池中执行，
+    // 不占用异步工作线程，并发的回测请求可分散到多个核心上并行
+    let strategy_id = params.strategy_id.clone();
+    let initial_capital = params.initial_capital;
+    let outcome = tokio::task::spawn_blocking(move || {
+        crate::engine::backtest::run_backtest(&strategy_id, &data, initial_capital)
+            .map_err(|e| e.to_string())
+    })
+    .await
+    .map_err(|e| {
+        (
+            StatusCode::INTERNAL_SERVER_ERROR,
+            Json(ApiError {
+                error: format!("内部任务执行失败: {}", e),
+                code: "INTERNAL_ERROR".to_string(),
+            }),
+        )
+    })?;
+
+    match outcome {
         Ok(result) => {
-            tracing::info!(
+            tracing::debug!(
                 symbol = %params.symbol,
                 strategy = %params.strategy_id,
                 total_return = result.total_return,
@@ -373,7 +404,7 @@ async fn run_backtest(
         Err(e) => Err((
             StatusCode::INTERNAL_SERVER_ERROR,
             Json(ApiError {
-                error: e.to_string(),
+                error: e,
                 code: "INTERNAL_ERROR".to_string(),
             }),
         )),
@@ -382,14 +413,14 @@ async fn run_backtest(
 
 /// GET /api/strategies
 /// 获取内置策略列表
-async fn get_strategies() -> Json<Vec<StrategyInfo>> {
-    Json(crate::strategies::get_strategy_list())
+async fn get_strategies() -> Json<&'static [StrategyInfo]> {
+    Json(crate::strategies::strategy_list())
 }
 
 /// GET /api/strategies/learn
 /// 获取策略学习内容
-async fn get_strategy_learn_list() -> Json<Vec<StrategyLearnDetail>> {
-    Json(crate::strategies::get_strategy_learn_list())
+async fn get_strategy_learn_list() -> Json<&'static [StrategyLearnDetail]> {
+    Json(crate::strategies::strategy_learn_list())
 }
 
 // ═══════════════════════════════════════════════════════════════════════════════
@@ -3,7 +3,7 @@
 //! 基于价格突破布林带上下轨进行反向操作的均值回归策略。
 
 use crate::types::OHLCV;
-use super::Signal;
+use super::{indicators, Signal, SignalType};
 
 /// 生成布林带买卖信号
 pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
@@ -14,61 +14,51 @@ pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
         return signals;
     }
 
-    let mut upper_bands = vec![0.0; n];
-    let mut lower_bands = vec![0.0; n];
-    let mut middle_bands = vec![0.0; n];
+    let closes = indicators::closes(data);
 
-    // 计算中轨(SMA20)和上下轨
-    for i in 19..n {
-        let mut sum = 0.0;
-        for j in (i - 19)..=i {
-            sum += data[j].close;
-        }
-        let mean = sum / 20.0;
-
-        let mut var_sum = 0.0;
-        for j in (i - 19)..=i {
-            var_sum += (data[j].close - mean).powi(2);
-        }
+    // 窗口 [i - 19, i] 的 (下轨, 中轨(SMA20), 上轨)
+    // 每日直接对窗口求均值和方差（O(20)、不分配内存），不做滑动累加：
+    // 整分价格下收盘价恰好等于中轨很常见，滑动更新的舍入误差会让这类相等关系翻转
+    let bands_at = |i: usize| -> (f64, f64, f64) {
+        let window = &closes[i - 19..=i];
+        let mean = indicators::window_mean(window);
+        let var_sum: f64 = window.iter().map(|&c| (c - mean).powi(2)).sum();
         let std_dev = (var_sum / 20.0).sqrt();
+        (mean - 2.0 * std_dev, mean, mean + 2.0 * std_dev)
+    };
 
-        upper_bands[i] = mean + 2.0 * std_dev;
-        lower_bands[i] = mean - 2.0 * std_dev;
-        middle_bands[i] = mean;
-    }
+    // 信号只比较前一日与当日的轨道，滚动保留前一日的值，不分配逐日数组
+    let (mut prev_lower, mut prev_mid, mut prev_upper) = bands_at(19);
 
     // 寻找突破信号
     for i in 20..n {
-        if data[i].volume == 0 {
-            continue; // 跳过停牌日
-        }
+        let (curr_lower, curr_mid, curr_upper) = bands_at(i);
 
-        let prev_close = data[i - 1].close;
-        let curr_close = data[i].close;
-        let prev_lower = lower_bands[i - 1];
-        let curr_lower = lower_bands[i];
-        let prev_upper = upper_bands[i - 1];
-        let curr_upper = upper_bands[i];
-        let prev_mid = middle_bands[i - 1];
-        let curr_mid = middle_bands[i];
+        // 停牌日不产生信号，但前一日轨道照常更新
+        if data[i].volume > 0 {
+            let prev_close = closes[i - 1];
+            let curr_close = closes[i];
 
-        // 买入：价格向下突破下轨或向上突破上轨（动量突破）
-        if (prev_close >= prev_lower && curr_close < curr_lower) ||
-           (prev_close <= prev_upper && curr_close > curr_upper) {
-            signals.push(Signal {
-                index: i,
-                signal_type: "buy".to_string(),
-            });
-        } 
-        // 卖出：价格从上或下穿越中轨（均值回归）
-        else if (prev_close > prev_mid && curr_close <= curr_mid) ||
-                (prev_close < prev_mid && curr_close >= curr_mid) {
-            // 只有当前偏离上下轨且触及中轨时才卖出，这确保了已经发生过突破
-            signals.push(Signal {
-                index: i,
-                signal_type: "sell".to_string(),
-            });
+            // 买入：价格向下突破下轨或向上突破上轨（动量突破）
+            if (prev_close >= prev_lower && curr_close < curr_lower) ||
+               (prev_close <= prev_upper && curr_close > curr_upper) {
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Buy,
+                });
+            }
+            // 卖出：价格从上或下穿越中轨（均值回归）
+            else if (prev_close > prev_mid && curr_close <= curr_mid) ||
+                    (prev_close < prev_mid && curr_close >= curr_mid) {
+                // 只有当前偏离上下轨且触及中轨时才卖出，这确保了已经发生过突破
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Sell,
+                });
+            }
         }
+
+        (prev_lower, prev_mid, prev_upper) = (curr_lower, curr_mid, curr_upper);
     }
 
     signals
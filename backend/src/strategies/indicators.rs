@@ -0,0 +1,22 @@
+//! 技术指标计算
+//!
+//! 各策略共用的指标函数，统一在收盘价序列上计算。
+
+use crate::types::OHLCV;
+
+/// 提取收盘价为连续的 f64 序列
+///
+/// 策略在进入计算前调用一次，之后所有指标都在这块连续内存上计算，
+/// 避免反复跨 OHLCV 结构体（含日期字符串）跳跃读取。
+pub fn closes(data: &[OHLCV]) -> Vec<f64> {
+    data.iter().map(|d| d.close).collect()
+}
+
+/// 窗口均值：按顺序直接累加窗口内的值再除以窗口长度
+///
+/// 每个点 O(窗口长度)，不分配内存，也不跨窗口滑动累加：
+/// 收盘价多为整分值，均线恰好相等（如 SMA5 == SMA20、收盘价 == 中轨）的情形很常见，
+/// 滑动累加和的舍入误差会让这些相等关系翻到比较的另一侧，从而改变交易信号。
+pub fn window_mean(window: &[f64]) -> f64 {
+    window.iter().sum::<f64>() / window.len() as f64
+}
@@ -3,7 +3,7 @@
 //! 利用指数平滑移动平均线差异衡量动能的趋势追踪工具。
 
 use crate::types::OHLCV;
-use super::Signal;
+use super::{indicators, Signal, SignalType};
 
 /// 生成 MACD 买卖信号
 pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
@@ -15,80 +15,76 @@ pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
         return signals;
     }
 
+    let closes = indicators::closes(data);
     let k12 = 2.0 / 13.0;
     let k26 = 2.0 / 27.0;
     let k9 = 2.0 / 10.0;
 
-    let mut ema12 = vec![0.0; n];
-    let mut ema26 = vec![0.0; n];
-    let mut macd = vec![0.0; n];
-    let mut signal_line = vec![0.0; n];
-    let mut histogram = vec![0.0; n];
+    // EMA12 / EMA26 / Signal 线都只依赖前一日的值，用标量滚动更新，不分配逐日数组
 
-    // 1. 计算 EMA12
-    let sum12: f64 = data[0..12].iter().map(|d| d.close).sum();
-    ema12[11] = sum12 / 12.0;
-    for i in 12..n {
-        ema12[i] = data[i].close * k12 + ema12[i - 1] * (1.0 - k12);
+    // 1. EMA12 以前 12 日均值为起点，预热到 index 25，与 EMA26 的起点对齐
+    let mut ema12 = closes[0..12].iter().sum::<f64>() / 12.0;
+    for &close in &closes[12..26] {
+        ema12 = close * k12 + ema12 * (1.0 - k12);
     }
 
-    // 2. 计算 EMA26 和 MACD
-    let sum26: f64 = data[0..26].iter().map(|d| d.close).sum();
-    ema26[25] = sum26 / 26.0;
-    macd[25] = ema12[25] - ema26[25];
-    for i in 26..n {
-        ema26[i] = data[i].close * k26 + ema26[i - 1] * (1.0 - k26);
-        macd[i] = ema12[i] - ema26[i];
-    }
-
-    // 3. 计算 Signal 线和 Histogram
-    // 第一根 Signal 线位于 index 33 (包含 macd[25] 到 macd[33] 共 9 个点)
-    let sum9: f64 = macd[25..=33].iter().sum();
-    signal_line[33] = sum9 / 9.0;
-    histogram[33] = macd[33] - signal_line[33];
-    for i in 34..n {
-        signal_line[i] = macd[i] * k9 + signal_line[i - 1] * (1.0 - k9);
-        histogram[i] = macd[i] - signal_line[i];
+    // 2. EMA26 以前 26 日均值为起点（index 25），MACD 从 index 25 开始有值
+    // 第一根 Signal 线位于 index 33 (macd[25] 到 macd[33] 共 9 个点的均值)
+    let mut ema26 = closes[0..26].iter().sum::<f64>() / 26.0;
+    let mut macd = ema12 - ema26;
+    let mut macd_sum = macd;
+    for &close in &closes[26..34] {
+        ema12 = close * k12 + ema12 * (1.0 - k12);
+        ema26 = close * k26 + ema26 * (1.0 - k26);
+        macd = ema12 - ema26;
+        macd_sum += macd;
     }
+    let mut signal_line = macd_sum / 9.0;
+    let mut prev_hist = macd - signal_line;
 
     // 首先检查初始状态
     if data[33].volume > 0 {
-        if histogram[33] > 0.0 || macd[33] > 0.0 {
+        if prev_hist > 0.0 || macd > 0.0 {
             signals.push(Signal {
                 index: 33,
-                signal_type: "buy".to_string(),
+                signal_type: SignalType::Buy,
             });
-        } else if histogram[33] < 0.0 || macd[33] < 0.0 {
+        } else if prev_hist < 0.0 || macd < 0.0 {
             signals.push(Signal {
                 index: 33,
-                signal_type: "sell".to_string(),
+                signal_type: SignalType::Sell,
             });
         }
     }
 
+    // 3. 逐日更新指标，同时检测 Histogram 穿越 0 轴
     for i in 34..n {
-        if data[i].volume == 0 {
-            continue; // 跳过停牌日
-        }
-
-        let prev_hist = histogram[i - 1];
-        let curr_hist = histogram[i];
+        let close = closes[i];
+        ema12 = close * k12 + ema12 * (1.0 - k12);
+        ema26 = close * k26 + ema26 * (1.0 - k26);
+        macd = ema12 - ema26;
+        signal_line = macd * k9 + signal_line * (1.0 - k9);
+        let curr_hist = macd - signal_line;
 
-        // 买入：Histogram 从下方上穿 0
-        // 买入：Histogram 从下方上穿 0，或者一直为 0 但 MACD 向上穿 0
-        if prev_hist <= 0.0 && curr_hist > 0.0 {
-            signals.push(Signal {
-                index: i,
-                signal_type: "buy".to_string(),
-            });
-        }
-        // 卖出：Histogram 从上方下穿 0
-        else if prev_hist >= 0.0 && curr_hist < 0.0 {
-            signals.push(Signal {
-                index: i,
-                signal_type: "sell".to_string(),
-            });
+        // 停牌日不产生信号，但指标照常更新
+        if data[i].volume > 0 {
+            // 买入：Histogram 从下方上穿 0
+            if prev_hist <= 0.0 && curr_hist > 0.0 {
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Buy,
+                });
+            }
+            // 卖出：Histogram 从上方下穿 0
+            else if prev_hist >= 0.0 && curr_hist < 0.0 {
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Sell,
+                });
+            }
         }
+
+        prev_hist = curr_hist;
     }
 
     signals
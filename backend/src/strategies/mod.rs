@@ -4,23 +4,69 @@
 
 use crate::types::{Formula, StrategyInfo, StrategyLearnDetail};
 use std::collections::HashMap;
+use std::sync::OnceLock;
 
+pub mod indicators;
 pub mod ma_cross;
 pub mod rsi;
 pub mod bollinger;
 pub mod macd;
 
 /// 交易信号
-#[derive(Debug, Clone)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
 pub struct Signal {
     /// 数据在数组中的索引
     pub index: usize,
-    /// 信号类型："buy" 或 "sell"
-    pub signal_type: String,
+    /// 信号类型
+    pub signal_type: SignalType,
+}
+
+/// 信号类型（买入 / 卖出）
+///
+/// 信号只在策略与回测引擎之间传递，用枚举而非字符串，
+/// 生成信号不分配堆内存，引擎按枚举分支而非字符串比较。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum SignalType {
+    Buy,
+    Sell,
+}
+
+/// 内置策略 ID，与回测引擎的策略分发一一对应
+pub const STRATEGY_IDS: [&str; 4] = ["dual-ma", "rsi", "bollinger", "macd"];
+
+/// 判断策略 ID 是否为内置策略
+pub fn is_known_strategy(strategy_id: &str) -> bool {
+    STRATEGY_IDS.contains(&strategy_id)
+}
+
+/// 内置策略信息列表，首次访问时构建
+static STRATEGY_LIST: OnceLock<Vec<StrategyInfo>> = OnceLock::new();
+
+/// 策略学习详情列表，首次访问时构建
+static STRATEGY_LEARN_LIST: OnceLock<Vec<StrategyLearnDetail>> = OnceLock::new();
+
+/// 获取所有内置策略信息（静态内容，构建一次后共享）
+pub fn strategy_list() -> &'static [StrategyInfo] {
+    STRATEGY_LIST.get_or_init(build_strategy_list)
+}
+
+/// 获取所有策略的学习详情（静态内容，构建一次后共享）
+pub fn strategy_learn_list() -> &'static [StrategyLearnDetail] {
+    STRATEGY_LEARN_LIST.get_or_init(build_strategy_learn_list)
 }
 
 /// 获取所有内置策略信息列表
 pub fn get_strategy_list() -> Vec<StrategyInfo> {
+    strategy_list().to_vec()
+}
+
+/// 获取所有策略的学习详情
+pub fn get_strategy_learn_list() -> Vec<StrategyLearnDetail> {
+    strategy_learn_list().to_vec()
+}
+
+/// 构建内置策略信息列表
+fn build_strategy_list() -> Vec<StrategyInfo> {
     vec![
         StrategyInfo {
             id: "dual-ma".to_string(),
@@ -63,8 +109,8 @@ pub fn get_strategy_list() -> Vec<StrategyInfo> {
     ]
 }
 
-/// 获取所有策略的学习详情
-pub fn get_strategy_learn_list() -> Vec<StrategyLearnDetail> {
+/// 构建策略学习详情列表
+fn build_strategy_learn_list() -> Vec<StrategyLearnDetail> {
     vec![
         StrategyLearnDetail {
             id: "dual-ma".to_string(),
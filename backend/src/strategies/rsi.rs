@@ -3,7 +3,7 @@
 //! 利用相对强弱指数寻找超买和超卖区间的震荡反转策略。
 
 use crate::types::OHLCV;
-use super::Signal;
+use super::{indicators, Signal, SignalType};
 
 /// 生成 RSI 买卖信号
 pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
@@ -14,13 +14,13 @@ pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
         return signals;
     }
 
-    let mut rsi_values = vec![0.0; n];
+    let closes = indicators::closes(data);
     let mut avg_gain = 0.0;
     let mut avg_loss = 0.0;
 
     // 计算最初的 14 个周期的平均涨跌幅
     for i in 1..=14 {
-        let change = data[i].close - data[i - 1].close;
+        let change = closes[i] - closes[i - 1];
         if change > 0.0 {
             avg_gain += change;
         } else {
@@ -30,59 +30,58 @@ pub fn generate_signals(data: &[OHLCV]) -> Vec<Signal> {
     avg_gain /= 14.0;
     avg_loss /= 14.0;
 
-    if avg_loss == 0.0 {
-        rsi_values[14] = if avg_gain == 0.0 { 50.0 } else { 100.0 };
-    } else {
-        let rs = avg_gain / avg_loss;
-        rsi_values[14] = 100.0 - (100.0 / (1.0 + rs));
-    }
+    // 信号只比较前一日与当日的 RSI，滚动保留前一日的值，不分配逐日数组
+    let mut prev_rsi = rsi_from_averages(avg_gain, avg_loss);
 
     // RSI 首次计算点的初始状态信号
-    if data[14].volume > 0 && rsi_values[14] > 50.0 {
+    if data[14].volume > 0 && prev_rsi > 50.0 {
         signals.push(Signal {
             index: 14,
-            signal_type: "buy".to_string(),
+            signal_type: SignalType::Buy,
         });
     }
 
     // 计算后续的 RSI，并产生信号
     for i in 15..n {
-        let change = data[i].close - data[i - 1].close;
+        let change = closes[i] - closes[i - 1];
         let gain = if change > 0.0 { change } else { 0.0 };
         let loss = if change < 0.0 { -change } else { 0.0 };
 
         avg_gain = (avg_gain * 13.0 + gain) / 14.0;
         avg_loss = (avg_loss * 13.0 + loss) / 14.0;
 
-        if avg_loss == 0.0 {
-            rsi_values[i] = if avg_gain == 0.0 { 50.0 } else { 100.0 };
-        } else {
-            let rs = avg_gain / avg_loss;
-            rsi_values[i] = 100.0 - (100.0 / (1.0 + rs));
-        }
+        let curr_rsi = rsi_from_averages(avg_gain, avg_loss);
 
-        if data[i].volume == 0 {
-            continue; // 跳过停牌日
+        // 停牌日不产生信号，但 RSI 照常滚动
+        if data[i].volume > 0 {
+            // 买入：RSI 从下方上穿 30
+            if prev_rsi <= 30.0 && curr_rsi > 30.0 {
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Buy,
+                });
+            }
+            // 卖出：RSI 从上方下穿 70
+            else if prev_rsi >= 70.0 && curr_rsi < 70.0 {
+                signals.push(Signal {
+                    index: i,
+                    signal_type: SignalType::Sell,
+                });
+            }
         }
 
-        let prev_rsi = rsi_values[i - 1];
-        let curr_rsi = rsi_values[i];
-
-        // 买入：RSI 从下方上穿 30
-        if prev_rsi <= 30.0 && curr_rsi > 30.0 {
-            signals.push(Signal {
-                index: i,
-                signal_type: "buy".to_string(),
-            });
-        } 
-        // 卖出：RSI 从上方下穿 70
-        else if prev_rsi >= 70.0 && curr_rsi < 70.0 {
-            signals.push(Signal {
-                index: i,
-                signal_type: "sell".to_string(),
-            });
-        }
+        prev_rsi = curr_rsi;
     }
 
     signals
 }
+
+/// 由平均涨幅与平均跌幅计算 RSI；无跌幅时涨跌皆无记 50，否则记 100
+fn rsi_from_averages(avg_gain: f64, avg_loss: f64) -> f64 {
+    if avg_loss == 0.0 {
+        if avg_gain == 0.0 { 50.0 } else { 100.0 }
+    } else {
+        let rs = avg_gain / avg_loss;
+        100.0 - (100.0 / (1.0 + rs))
+    }
+}
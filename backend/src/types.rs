@@ -4,6 +4,7 @@
 //! 字段命名规范：JSON 通信统一使用 camelCase，Rust 端通过 serde 属性映射。
 //! 完整契约文档：`docs/api-contract.md`
 
+use chrono::NaiveDate;
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 
@@ -59,6 +60,25 @@ pub struct IndexSnapshot {
     pub change: f64,
 }
 
+// ─── 日期参数 ───────────────────────────────────────────────────────────────
+
+/// 解析 `YYYY-MM-DD` 格式的日期参数（HTTP 接口与 Tauri 命令共用）
+///
+/// 只接受补零的标准形式：chrono 的解析对空格、符号和不补零的月日较宽松，
+/// 而下游缓存层按字符串比较日期，非标准形式会让范围比较出错。
+/// 格式或日期不合法时返回错误信息，`name` 为参数名。
+pub fn parse_date(name: &str, value: &str) -> Result<NaiveDate, String> {
+    let canonical = value.len() == 10
+        && value.bytes().enumerate().all(|(i, b)| match i {
+            4 | 7 => b == b'-',
+            _ => b.is_ascii_digit(),
+        });
+    canonical
+        .then(|| NaiveDate::parse_from_str(value, "%Y-%m-%d").ok())
+        .flatten()
+        .ok_or_else(|| format!("{name} 日期格式错误，应为 YYYY-MM-DD: {value}"))
+}
+
 // ─── 回测参数 ───────────────────────────────────────────────────────────────
 
 /// BacktestParams — 回测请求参数
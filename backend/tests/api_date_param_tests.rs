@@ -0,0 +1,68 @@
+//! 日期参数校验测试
+//!
+//! 日线与回测接口的日期参数必须是严格的 `YYYY-MM-DD` 合法日期，
+//! 否则在访问数据源之前直接返回 400 + INVALID_PARAM。
+
+use axum::http::StatusCode;
+use axum_test::TestServer;
+use quant_backend::routes::create_router;
+use quant_backend::types::*;
+
+/// 创建测试服务器
+fn test_server() -> TestServer {
+    let app = create_router();
+    TestServer::new(app).expect("创建测试服务器失败")
+}
+
+/// 日线接口：格式错误或不存在的日期返回 400
+#[tokio::test]
+async fn test_get_daily_api_malformed_date() {
+    let server = test_server();
+    for (start, end) in [
+        ("2024-1-2", "2024-06-30"),
+        ("2024-01-01", "2024-02-30"),
+        ("20240101", "2024-06-30"),
+        (" 2024-1-05", "2024-06-30"),
+    ] {
+        let resp = server
+            .get("/api/stocks/000001/daily")
+            .add_query_param("start", start)
+            .add_query_param("end", end)
+            .await;
+
+        resp.assert_status(StatusCode::BAD_REQUEST);
+        let error: ApiError = resp.json();
+        assert_eq!(error.code, "INVALID_PARAM", "start={start} end={end}");
+    }
+}
+
+/// 回测接口：格式错误的日期返回 400
+#[tokio::test]
+async fn test_backtest_api_malformed_date() {
+    let server = test_server();
+    let params = serde_json::json!({
+        "strategyId": "dual-ma",
+        "symbol": "000001",
+        "startDate": "2024/01/01",
+        "endDate": "2024-06-30",
+        "initialCapital": 100000
+    });
+
+    let resp = server.post("/api/backtest").json(&params).await;
+
+    resp.assert_status(StatusCode::BAD_REQUEST);
+    let error: ApiError = resp.json();
+    assert_eq!(error.code, "INVALID_PARAM");
+}
+
+/// 共用的日期解析：只接受补零的标准 YYYY-MM-DD 合法日期
+#[test]
+fn test_parse_date_strict_format() {
+    assert!(parse_date("start", "2024-01-05").is_ok());
+    assert!(parse_date("start", "2024-02-29").is_ok());
+
+    for bad in ["2024-1-5", "2024-02-30", "20240105", " 2024-01-05", "+024-01-05", "2024/01/05", ""] {
+        let err = parse_date("start", bad).unwrap_err();
+        assert!(err.starts_with("start 日期格式错误"), "{bad}: {err}");
+    }
+}
@@ -0,0 +1,55 @@
+//! 多策略并行回测测试
+//!
+//! `run_backtests` 并行执行的结果必须与逐个调用 `run_backtest` 完全一致，且保持输入顺序。
+
+use quant_backend::engine::backtest::{run_backtest, run_backtests};
+use quant_backend::strategies::STRATEGY_IDS;
+use quant_backend::types::OHLCV;
+
+/// 构造先涨后跌再涨的波动序列，使各策略都能产生交易
+fn make_wave(days: usize) -> Vec<OHLCV> {
+    (0..days)
+        .map(|i| {
+            let close = 50.0 + 10.0 * (i as f64 / 15.0).sin() + 0.05 * i as f64;
+            OHLCV {
+                date: format!("2024-{:02}-{:02}", i / 28 + 1, i % 28 + 1),
+                open: close - 0.3,
+                high: close + 0.8,
+                low: close - 0.8,
+                close,
+                volume: 1_000_000,
+            }
+        })
+        .collect()
+}
+
+/// 并行结果与串行结果逐项一致，顺序与输入一致
+#[test]
+fn test_run_backtests_matches_sequential() {
+    let data = make_wave(300);
+    let results = run_backtests(&STRATEGY_IDS, &data, 100_000.0);
+    assert_eq!(results.len(), STRATEGY_IDS.len());
+
+    for (id, parallel) in STRATEGY_IDS.iter().zip(&results) {
+        let parallel = parallel.as_ref().expect("内置策略回测不应失败");
+        let sequential = run_backtest(id, &data, 100_000.0).unwrap();
+        assert_eq!(parallel.trade_count, sequential.trade_count, "策略 {id}");
+        assert_eq!(parallel.total_return, sequential.total_return, "策略 {id}");
+        assert_eq!(parallel.max_drawdown, sequential.max_drawdown, "策略 {id}");
+        assert_eq!(parallel.sharpe_ratio, sequential.sharpe_ratio, "策略 {id}");
+        assert_eq!(parallel.equity_curve.len(), data.len(), "策略 {id}");
+    }
+}
+
+/// 未知策略只在对应位置返回错误，不影响其他策略
+#[test]
+fn test_run_backtests_isolates_errors() {
+    let data = make_wave(120);
+    let results = run_backtests(&["dual-ma", "no-such-strategy", "rsi"], &data, 100_000.0);
+    assert_eq!(results.len(), 3);
+    assert!(results[0].is_ok());
+    assert!(results[1].is_err());
+    assert!(results[2].is_ok());
+
+    assert!(run_backtests(&[], &data, 100_000.0).is_empty());
+}
@@ -0,0 +1,132 @@
+//! SQLite 缓存存储格式测试
+//!
+//! 覆盖 stock_daily 表的存储细节：
+//! 1. 批量写入 — 超过单批行数时的多行 INSERT 与余数处理
+//! 2. 旧库迁移 — date 列从 TEXT (YYYY-MM-DD) 迁移为 INTEGER (YYYYMMDD)，
+//!    rowid 表重建为 WITHOUT ROWID 聚簇表
+
+use chrono::{Duration, NaiveDate};
+use quant_backend::data::cache::CacheDb;
+use quant_backend::types::OHLCV;
+use rusqlite::Connection;
+
+/// 构造从 2020-01-01 起连续 `days` 天的 OHLCV 数据
+fn make_series(days: usize) -> Vec<OHLCV> {
+    let start = NaiveDate::from_ymd_opt(2020, 1, 1).unwrap();
+    (0..days)
+        .map(|i| {
+            let close = 10.0 + i as f64 * 0.01;
+            OHLCV {
+                date: (start + Duration::days(i as i64)).format("%Y-%m-%d").to_string(),
+                open: close - 0.05,
+                high: close + 0.1,
+                low: close - 0.1,
+                close,
+                volume: 1000 + i as u64,
+            }
+        })
+        .collect()
+}
+
+/// 超过单批行数（含余数）的数据应完整写入并按日期升序读回
+#[test]
+fn test_store_large_batch_roundtrip() {
+    let db = CacheDb::new(Connection::open_in_memory().unwrap()).unwrap();
+    let data = make_series(250);
+
+    db.store_daily_data("000001", &data).expect("批量存储失败");
+
+    let loaded = db
+        .load_daily_data("000001", "2020-01-01", "2020-12-31")
+        .expect("读取失败");
+    assert_eq!(loaded.len(), data.len(), "所有行都应写入");
+    for (a, b) in loaded.iter().zip(&data) {
+        assert_eq!(a.date, b.date);
+        assert_eq!(a.close, b.close);
+        assert_eq!(a.volume, b.volume);
+    }
+}
+
+/// 旧版 TEXT 日期列的数据库打开后应自动迁移，数据保持可读
+#[test]
+fn test_migrates_text_date_column() {
+    let conn = Connection::open_in_memory().unwrap();
+    conn.execute_batch(
+        "CREATE TABLE stock_daily (
+            symbol TEXT NOT NULL,
+            date TEXT NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            volume INTEGER NOT NULL,
+            PRIMARY KEY (symbol, date)
+        );
+        INSERT INTO stock_daily VALUES ('000001', '2024-01-02', 10.0, 10.5, 9.5, 10.2, 1000);
+        INSERT INTO stock_daily VALUES ('000001', '2024-01-03', 10.2, 10.8, 10.0, 10.6, 2000);",
+    )
+    .unwrap();
+
+    let db = CacheDb::new(conn).expect("迁移失败");
+
+    let loaded = db
+        .load_daily_data("000001", "2024-01-01", "2024-01-31")
+        .expect("读取失败");
+    assert_eq!(loaded.len(), 2);
+    assert_eq!(loaded[0].date, "2024-01-02");
+    assert_eq!(loaded[1].date, "2024-01-03");
+    assert_eq!(loaded[1].close, 10.6);
+}
+
+/// 非法日期格式应返回错误，而不是按文本比较
+#[test]
+fn test_load_rejects_malformed_date() {
+    let db = CacheDb::new(Connection::open_in_memory().unwrap()).unwrap();
+    assert!(db.load_daily_data("000001", "2024-1-2", "2024-01-31").is_err());
+}
+
+/// 旧版 rowid 表（INTEGER 日期）打开后应重建为 WITHOUT ROWID 表，数据不丢失
+#[test]
+fn test_migrates_rowid_table_to_without_rowid() {
+    let path = std::env::temp_dir().join(format!(
+        "quant-cache-migrate-{}.db",
+        std::process::id()
+    ));
+    let _ = std::fs::remove_file(&path);
+
+    let conn = Connection::open(&path).unwrap();
+    conn.execute_batch(
+        "CREATE TABLE stock_daily (
+            symbol TEXT NOT NULL,
+            date INTEGER NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            volume INTEGER NOT NULL,
+            PRIMARY KEY (symbol, date)
+        );
+        INSERT INTO stock_daily VALUES ('000001', 20240102, 10.0, 10.5, 9.5, 10.2, 1000);",
+    )
+    .unwrap();
+
+    let db = CacheDb::new(conn).expect("迁移失败");
+    let loaded = db
+        .load_daily_data("000001", "2024-01-01", "2024-01-31")
+        .expect("读取失败");
+    assert_eq!(loaded.len(), 1);
+    assert_eq!(loaded[0].date, "2024-01-02");
+    drop(db);
+
+    let check = Connection::open(&path).unwrap();
+    let table_sql: String = check
+        .query_row(
+            "SELECT sql FROM sqlite_master WHERE name = 'stock_daily'",
+            [],
+            |row| row.get(0),
+        )
+        .unwrap();
+    drop(check);
+    let _ = std::fs::remove_file(&path);
+    assert!(table_sql.contains("WITHOUT ROWID"), "表结构未迁移: {table_sql}");
+}
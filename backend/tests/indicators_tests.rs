@@ -0,0 +1,60 @@
+//! 技术指标测试
+//!
+//! 验证 strategies::indicators 中的指标函数与逐项直接计算的结果一致。
+
+use quant_backend::strategies::indicators;
+use quant_backend::types::OHLCV;
+
+/// 构造有涨有跌的价格序列
+fn make_prices(days: usize) -> Vec<f64> {
+    (0..days)
+        .map(|i| 20.0 + (i as f64 * 0.7).sin() * 3.0 + i as f64 * 0.05)
+        .collect()
+}
+
+/// 窗口均值与按顺序逐项累加的结果逐位一致
+#[test]
+fn test_window_mean_matches_sequential_sum() {
+    let prices = make_prices(60);
+    for len in [1, 5, 20, 60] {
+        let window = &prices[60 - len..];
+        let mut sum = 0.0;
+        for &p in window {
+            sum += p;
+        }
+        assert_eq!(indicators::window_mean(window), sum / len as f64, "窗口长度 {len}");
+    }
+}
+
+/// 整分价格上相同的窗口内容得到完全相同的均值，与窗口在序列中的位置无关
+#[test]
+fn test_window_mean_exact_on_cent_prices() {
+    let cents = [10.01, 10.02, 10.03, 10.04, 10.05];
+    let mut series = cents.to_vec();
+    series.extend_from_slice(&[99.99, 0.01, 55.55]);
+    series.extend_from_slice(&cents);
+
+    assert_eq!(
+        indicators::window_mean(&series[..5]),
+        indicators::window_mean(&series[series.len() - 5..])
+    );
+}
+
+/// 收盘价提取应保持顺序与长度
+#[test]
+fn test_closes_extracts_in_order() {
+    let data: Vec<OHLCV> = make_prices(5)
+        .into_iter()
+        .enumerate()
+        .map(|(i, close)| OHLCV {
+            date: format!("2024-01-{:02}", i + 1),
+            open: close,
+            high: close,
+            low: close,
+            close,
+            volume: 100,
+        })
+        .collect();
+    let closes = indicators::closes(&data);
+    assert_eq!(closes, make_prices(5));
+}
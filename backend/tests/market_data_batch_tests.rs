@@ -0,0 +1,46 @@
+//! 批量获取日 K 线测试
+//!
+//! 验证 `get_stocks_daily` 的结果与逐只调用 `get_stock_daily` 一致，且保持输入顺序。
+
+use std::time::Duration;
+
+use quant_backend::data::market_data;
+
+/// 批量结果按输入顺序返回，数据与单独获取一致
+///
+/// 只用两只股票并在单独获取前等待 2 秒，整个测试的请求频率保持在东财安全线内。
+#[tokio::test]
+async fn test_get_stocks_daily_matches_single_fetch() {
+    let symbols = ["000001", "600519"];
+    let batch = market_data::get_stocks_daily(&symbols, "2024-01-02", "2024-01-31")
+        .await
+        .expect("批量获取失败");
+
+    assert_eq!(batch.len(), symbols.len());
+    for ((symbol, data), expected_symbol) in batch.iter().zip(symbols) {
+        assert_eq!(symbol, expected_symbol, "结果顺序应与输入一致");
+        assert!(!data.is_empty(), "{symbol} 应返回数据");
+        assert!(data.iter().all(|d| d.date.as_str() >= "2024-01-02" && d.date.as_str() <= "2024-01-31"));
+    }
+
+    // 单独获取第一只股票作为对照
+    tokio::time::sleep(Duration::from_secs(2)).await;
+    let single = market_data::get_stock_daily(symbols[0], "2024-01-02", "2024-01-31")
+        .await
+        .expect("单只获取失败");
+    let (_, data) = &batch[0];
+    assert_eq!(data.len(), single.len(), "{} 条数不一致", symbols[0]);
+    for (a, b) in data.iter().zip(&single) {
+        assert_eq!(a.date, b.date);
+        assert_eq!(a.close, b.close);
+    }
+}
+
+/// 空列表直接返回空结果
+#[tokio::test]
+async fn test_get_stocks_daily_empty() {
+    let batch = market_data::get_stocks_daily(&[], "2024-01-02", "2024-01-31")
+        .await
+        .expect("空列表不应报错");
+    assert!(batch.is_empty());
+}
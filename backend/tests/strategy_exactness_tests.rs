@@ -0,0 +1,137 @@
+//! 策略信号精确性测试
+//!
+//! A 股收盘价为整分值，均线、中轨与收盘价恰好相等的情形很常见，
+//! 指标计算中的任何舍入差异都会让这些相等关系翻转、改变交易信号。
+//! 这里用按分取整的随机价格序列，将策略信号与逐窗口直接计算的对照实现逐项比较。
+
+use quant_backend::strategies::{bollinger, ma_cross, Signal, SignalType};
+use quant_backend::types::OHLCV;
+
+/// 构造按分取整的随机游走价格序列（5~50 元，约 3% 停牌日）
+fn make_cent_series(seed: u64, days: usize) -> Vec<OHLCV> {
+    let mut state = seed.wrapping_mul(0x9E37_79B9_7F4A_7C15) ^ 0xDEAD_BEEF;
+    let mut next = || {
+        state = state
+            .wrapping_mul(6364136223846793005)
+            .wrapping_add(1442695040888963407);
+        (state >> 11) as f64 / (1u64 << 53) as f64
+    };
+
+    let mut price = 5.0 + next() * 45.0;
+    (0..days)
+        .map(|i| {
+            price = (price * (1.0 + (next() - 0.5) * 0.06)).clamp(5.0, 50.0);
+            let close = (price * 100.0).round() / 100.0;
+            let volume = if next() < 0.03 { 0 } else { 100_000 };
+            OHLCV {
+                date: format!("{:04}-{:02}-{:02}", 2000 + i / 336, i / 28 % 12 + 1, i % 28 + 1),
+                open: close,
+                high: close,
+                low: close,
+                close,
+                volume,
+            }
+        })
+        .collect()
+}
+
+/// 窗口 [end + 1 - len, end] 的收盘价均值，逐项直接求和
+fn direct_mean(data: &[OHLCV], end: usize, len: usize) -> f64 {
+    data[end + 1 - len..=end].iter().map(|d| d.close).sum::<f64>() / len as f64
+}
+
+fn signal(index: usize, signal_type: SignalType) -> Signal {
+    Signal { index, signal_type }
+}
+
+/// 双均线对照实现：每日直接计算 SMA5 / SMA20
+fn reference_ma_cross(data: &[OHLCV]) -> Vec<Signal> {
+    let mut signals = Vec::new();
+    if data.len() < 20 {
+        return signals;
+    }
+    let ratio = 0.005;
+
+    let (fast, slow) = (direct_mean(data, 19, 5), direct_mean(data, 19, 20));
+    if data[19].volume > 0 {
+        if fast - slow > ratio * slow {
+            signals.push(signal(19, SignalType::Buy));
+        } else if fast - slow < -ratio * slow {
+            signals.push(signal(19, SignalType::Sell));
+        }
+    }
+
+    for i in 20..data.len() {
+        if data[i].volume == 0 {
+            continue;
+        }
+        let (prev_fast, prev_slow) = (direct_mean(data, i - 1, 5), direct_mean(data, i - 1, 20));
+        let (fast, slow) = (direct_mean(data, i, 5), direct_mean(data, i, 20));
+        if fast > slow && prev_fast <= prev_slow && fast - slow > ratio * slow {
+            signals.push(signal(i, SignalType::Buy));
+        } else if fast < slow && prev_fast >= prev_slow && slow - fast > ratio * slow {
+            signals.push(signal(i, SignalType::Sell));
+        }
+    }
+    signals
+}
+
+/// 双均线信号在整分价格上与逐窗口直接计算完全一致
+#[test]
+fn test_ma_cross_matches_direct_windows_on_cent_prices() {
+    for seed in 0..300 {
+        let data = make_cent_series(seed, 400);
+        assert_eq!(
+            ma_cross::generate_signals(&data),
+            reference_ma_cross(&data),
+            "seed {seed}"
+        );
+    }
+}
+
+/// 布林带对照实现：每日直接计算窗口均值与标准差
+fn reference_bollinger(data: &[OHLCV]) -> Vec<Signal> {
+    let mut signals = Vec::new();
+    if data.len() < 20 {
+        return signals;
+    }
+
+    let bands = |i: usize| {
+        let mean = direct_mean(data, i, 20);
+        let var_sum: f64 = data[i - 19..=i].iter().map(|d| (d.close - mean).powi(2)).sum();
+        let std_dev = (var_sum / 20.0).sqrt();
+        (mean - 2.0 * std_dev, mean, mean + 2.0 * std_dev)
+    };
+
+    for i in 20..data.len() {
+        if data[i].volume == 0 {
+            continue;
+        }
+        let (prev_close, curr_close) = (data[i - 1].close, data[i].close);
+        let (prev_lower, prev_mid, prev_upper) = bands(i - 1);
+        let (curr_lower, curr_mid, curr_upper) = bands(i);
+        if (prev_close >= prev_lower && curr_close < curr_lower)
+            || (prev_close <= prev_upper && curr_close > curr_upper)
+        {
+            signals.push(signal(i, SignalType::Buy));
+        } else if (prev_close > prev_mid && curr_close <= curr_mid)
+            || (prev_close < prev_mid && curr_close >= curr_mid)
+        {
+            signals.push(signal(i, SignalType::Sell));
+        }
+    }
+    signals
+}
+
+/// 布林带信号在整分价格上与逐窗口直接计算完全一致
+#[test]
+fn test_bollinger_matches_direct_windows_on_cent_prices() {
+    for seed in 0..300 {
+        let data = make_cent_series(seed, 400);
+        assert_eq!(
+            bollinger::generate_signals(&data),
+            reference_bollinger(&data),
+            "seed {seed}"
+        );
+    }
+}
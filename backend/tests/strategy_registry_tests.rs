@@ -0,0 +1,32 @@
+//! 策略注册表一致性测试
+//!
+//! `STRATEGY_IDS` 被路由和桌面端用于参数校验，必须与策略列表、
+//! 学习详情和回测引擎的策略分发保持一致。
+
+use quant_backend::engine::backtest::run_backtest;
+use quant_backend::strategies::{self, STRATEGY_IDS};
+
+/// 策略列表与学习详情的 ID 均与 STRATEGY_IDS 一致
+#[test]
+fn test_strategy_ids_match_catalogue() {
+    let listed: Vec<&str> = strategies::strategy_list().iter().map(|s| s.id.as_str()).collect();
+    assert_eq!(listed, STRATEGY_IDS);
+
+    let learn: Vec<&str> = strategies::strategy_learn_list()
+        .iter()
+        .map(|s| s.id.as_str())
+        .collect();
+    assert_eq!(learn, STRATEGY_IDS);
+}
+
+/// 每个已注册的策略 ID 都能被回测引擎识别，未注册的被拒绝
+#[test]
+fn test_registered_strategies_run_in_engine() {
+    for id in STRATEGY_IDS {
+        assert!(strategies::is_known_strategy(id));
+        assert!(run_backtest(id, &[], 100000.0).is_ok(), "引擎未识别策略 {id}");
+    }
+
+    assert!(!strategies::is_known_strategy("unknown"));
+    assert!(run_backtest("unknown", &[], 100000.0).is_err());
+}
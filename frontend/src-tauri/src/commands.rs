@@ -5,7 +5,8 @@
 
 use std::collections::HashMap;
 
-use quant_backend::data::cache::get_stock_daily_cached;
+use quant_backend::data::cache::get_stock_daily_cached_with_client;
+use quant_backend::data::market_data;
 use quant_backend::types::*;
 use tauri::State;
 
@@ -17,11 +18,14 @@ use crate::TauriAppState;
 ///
 /// 对应 GET /api/stocks/search?q={keyword}
 #[tauri::command]
-pub async fn search_stocks(keyword: String) -> Result<Vec<StockInfo>, String> {
+pub async fn search_stocks(
+    state: State<'_, TauriAppState>,
+    keyword: String,
+) -> Result<Vec<StockInfo>, String> {
     if keyword.is_empty() {
         return Ok(vec![]);
     }
-    quant_backend::data::market_data::search_stocks(&keyword)
+    market_data::search_stocks_with_client(&state.http, &keyword)
         .await
         .map_err(|e| e.to_string())
 }
@@ -36,18 +40,31 @@ pub async fn get_stock_daily(
     start: String,
     end: String,
 ) -> Result<Vec<OHLCV>, String> {
-    // 参数校验
-    if start > end {
+    // 参数校验：日期格式合法且 start <= end（与 HTTP 接口一致）
+    if parse_date("start", &start)? > parse_date("end", &end)? {
         return Err("start 日期必须早于或等于 end 日期".to_string());
     }
 
+    load_daily_blocking(&state, symbol, start, end).await
+}
+
+/// 经 SQLite 缓存加载 K 线数据（日线命令与回测命令共用）
+///
+/// 缓存连接在锁内同步使用，因此整个加载过程放到阻塞线程池中执行。
+async fn load_daily_blocking(
+    state: &TauriAppState,
+    symbol: String,
+    start: String,
+    end: String,
+) -> Result<Vec<OHLCV>, String> {
     let db = state.db.clone();
+    let http = state.http.clone();
     let rt_handle = tokio::runtime::Handle::current();
 
     tokio::task::spawn_blocking(move || -> Result<Vec<OHLCV>, String> {
         let db = db.lock().map_err(|e| format!("数据库锁获取失败: {}", e))?;
         rt_handle
-            .block_on(get_stock_daily_cached(&db, &symbol, &start, &end))
+            .block_on(get_stock_daily_cached_with_client(&db, &http, &symbol, &start, &end))
             .map_err(|e| e.to_string())
     })
     .await
@@ -58,8 +75,10 @@ pub async fn get_stock_daily(
 ///
 /// 对应 GET /api/index/snapshot
 #[tauri::command]
-pub async fn get_index_snapshot() -> Result<Vec<IndexSnapshot>, String> {
-    quant_backend::data::market_data::get_index_snapshot()
+pub async fn get_index_snapshot(
+    state: State<'_, TauriAppState>,
+) -> Result<Vec<IndexSnapshot>, String> {
+    market_data::get_index_snapshot_with_client(&state.http)
         .await
         .map_err(|e| e.to_string())
 }
@@ -75,40 +94,34 @@ pub async fn run_backtest(
     params: BacktestParams,
 ) -> Result<BacktestResult, String> {
     // 参数校验
-    let valid_strategies = ["dual-ma", "rsi", "bollinger", "macd"];
-    if !valid_strategies.contains(&params.strategy_id.as_str()) {
+    if !quant_backend::strategies::is_known_strategy(&params.strategy_id) {
         return Err(format!("策略 '{}' 不存在", params.strategy_id));
     }
-    if params.start_date >= params.end_date {
+    if parse_date("startDate", &params.start_date)? >= parse_date("endDate", &params.end_date)? {
         return Err("startDate 必须早于 endDate".to_string());
     }
     if params.initial_capital <= 0.0 {
         return Err("initialCapital 必须大于 0".to_string());
     }
 
-    let symbol = params.symbol.clone();
-    let start = params.start_date.clone();
-    let end = params.end_date.clone();
-    let db = state.db.clone();
-    let rt_handle = tokio::runtime::Handle::current();
-
     // 获取股票数据
-    let data = tokio::task::spawn_blocking(move || -> Result<Vec<OHLCV>, String> {
-        let db = db.lock().map_err(|e| format!("数据库锁获取失败: {}", e))?;
-        rt_handle
-            .block_on(get_stock_daily_cached(&db, &symbol, &start, &end))
+    let data = load_daily_blocking(
+        &state,
+        params.symbol.clone(),
+        params.start_date.clone(),
+        params.end_date.clone(),
+    )
+    .await?;
+
+    // 执行回测：纯 CPU 计算放到阻塞线程池中执行，不占用异步工作线程
+    let strategy_id = params.strategy_id;
+    let initial_capital = params.initial_capital;
+    tokio::task::spawn_blocking(move || {
+        quant_backend::engine::backtest::run_backtest(&strategy_id, &data, initial_capital)
             .map_err(|e| e.to_string())
     })
     .await
-    .map_err(|e| format!("内部任务执行失败: {}", e))??;
-
-    // 执行回测
-    quant_backend::engine::backtest::run_backtest(
-        &params.strategy_id,
-        &data,
-        params.initial_capital,
-    )
-    .map_err(|e| e.to_string())
+    .map_err(|e| format!("内部任务执行失败: {}", e))?
 }
 
 /// 获取内置策略列表
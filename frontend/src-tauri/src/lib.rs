@@ -7,13 +7,16 @@ mod commands;
 use tauri::Manager;
 
 use quant_backend::data::cache::CacheDb;
+use quant_backend::data::market_data;
 use rusqlite::Connection;
 use std::sync::{Arc, Mutex};
 use tracing_subscriber::EnvFilter;
 
-/// Tauri 应用共享状态 — 包含 SQLite 缓存数据库连接
+/// Tauri 应用共享状态 — 包含 SQLite 缓存数据库连接与 HTTP 客户端
 pub struct TauriAppState {
     pub db: Arc<Mutex<CacheDb>>,
+    /// 全部行情请求共用的客户端（连接池），应用启动时只构建一次
+    pub http: market_data::Client,
 }
 
 /// 启动 Tauri 应用
@@ -43,9 +46,12 @@ pub fn run() {
                 .unwrap_or_else(|e| panic!("无法打开 SQLite 数据库: {}", e));
             let cache_db = CacheDb::new(conn)
                 .unwrap_or_else(|e| panic!("CacheDb 初始化失败: {}", e));
+            let http = market_data::build_client()
+                .unwrap_or_else(|e| panic!("HTTP 客户端初始化失败: {}", e));
 
             app.manage(TauriAppState {
                 db: Arc::new(Mutex::new(cache_db)),
+                http,
             });
 
             tracing::info!("Tauri 应用初始化完成");